@@ -13,8 +13,10 @@ from dotenv import load_dotenv
 
 from app.config import get_config
 from app.extensions import db
+from app.json_provider import OrjsonProvider
 from controller import register_blueprints
 from commands import register_commands
+from resources.platform.questions.service import warm_up_queries
 
 # Import all models to ensure they are registered with SQLAlchemy
 import models
@@ -43,6 +45,9 @@ def create_app(config_class=None):
     app.config['SPEC_FORMAT'] = 'json'
     app.config['AUTO_VALIDATION'] = True
 
+    # Serialize JSON responses with orjson
+    app.json = OrjsonProvider(app)
+
     # Initialize extensions
     db.init_app(app)
 
@@ -55,9 +60,10 @@ def create_app(config_class=None):
     # Register CLI commands
     register_commands(app)
 
-    # Create database tables
+    # Create database tables and compile the hot queries
     with app.app_context():
         db.create_all()
+        warm_up_queries()
 
     return app
 
@@ -0,0 +1,28 @@
+"""
+JSON provider backed by orjson.
+
+Replaces Flask's default provider for every JSON response, encoding the
+payload in native code instead of the stdlib json module.
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj to a JSON string, honouring sort_keys and indent."""
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+
+        # Types orjson does not know (Decimal, objects with __html__, ...)
+        # fall back to Flask's default conversion
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
@@ -10,6 +10,22 @@ from resources.platform.content.controller import content_bp
 from resources.platform.profile.controller import profile_bp
 from resources.platform.prover.controller import prover_bp
 from resources.platform.questions.controller import questions_bp
+from utils.auth import register_auth_filter
+
+
+# Url prefixes whose token is verified before routing:
+# (prefix, required role, prefix of the g attributes)
+PROTECTED_PREFIXES = (
+    ('/api/admin', 'admin', 'current_admin'),
+    ('/api/courses', None, 'current_user'),
+    ('/api/content', None, 'current_user'),
+    ('/api/profile', None, 'current_user'),
+)
+
+# Routes inside a protected prefix that do not require a token
+PUBLIC_PREFIXES = (
+    '/api/admin/auth/',
+)
 
 
 def register_blueprints(app):
@@ -24,3 +40,6 @@ def register_blueprints(app):
     app.register_blueprint(profile_bp)
     app.register_blueprint(prover_bp)
     app.register_blueprint(questions_bp)
+
+    # Authentication of the protected blueprints
+    register_auth_filter(app, PROTECTED_PREFIXES, PUBLIC_PREFIXES)
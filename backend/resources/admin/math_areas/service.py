@@ -6,6 +6,7 @@ from sqlalchemy import select, func
 
 from app.extensions import db
 from models import MathArea, MathSubarea, Question
+from utils.cache import cache, MATH_AREAS_CACHE_KEY, subareas_cache_key
 from utils.response import Result
 
 
@@ -121,6 +122,7 @@ class MathAreaService:
 
         db.session.add(area)
         db.session.commit()
+        cache.delete(MATH_AREAS_CACHE_KEY)
 
         return Result.success(
             value=MathAreaService._serialize_area(area),
@@ -173,6 +175,7 @@ class MathAreaService:
         area.updated_at = datetime.now(timezone.utc)
 
         db.session.commit()
+        cache.delete(MATH_AREAS_CACHE_KEY)
 
         return Result.success(
             value=MathAreaService._serialize_area(area),
@@ -211,6 +214,7 @@ class MathAreaService:
 
         db.session.delete(area)
         db.session.commit()
+        cache.delete(MATH_AREAS_CACHE_KEY, subareas_cache_key(area_id))
 
         return Result.success(
             value=None,
@@ -301,6 +305,7 @@ class MathAreaService:
 
         db.session.add(subarea)
         db.session.commit()
+        cache.delete(subareas_cache_key(subarea.math_area_id))
 
         return Result.success(
             value=MathAreaService._serialize_subarea(subarea),
@@ -350,6 +355,7 @@ class MathAreaService:
         subarea.updated_at = datetime.now(timezone.utc)
 
         db.session.commit()
+        cache.delete(subareas_cache_key(subarea.math_area_id))
 
         return Result.success(
             value=MathAreaService._serialize_subarea(subarea),
@@ -379,8 +385,10 @@ class MathAreaService:
                 code="HAS_QUESTIONS"
             )
 
+        math_area_id = subarea.math_area_id
         db.session.delete(subarea)
         db.session.commit()
+        cache.delete(subareas_cache_key(math_area_id))
 
         return Result.success(
             value=None,
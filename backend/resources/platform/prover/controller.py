@@ -2,6 +2,7 @@
 from http import HTTPStatus
 
 from apiflask import APIBlueprint
+from flask import Response, stream_with_context
 
 from resources.platform.prover.prove.service import ProveService
 from resources.platform.prover.prove.schemas import ProveRequestSchema, ProveResponseSchema
@@ -25,8 +26,15 @@ def status():
 
 @prover_bp.post('/prove')
 @prover_bp.input(ProveRequestSchema)
-@prover_bp.output(ProveResponseSchema)
-@prover_bp.doc(tags=['Equivalence'], summary='Prove equivalence between two propositions')
+@prover_bp.doc(
+    tags=['Equivalence'],
+    summary='Prove equivalence between two propositions',
+    # The body is streamed by the view, so the schema only documents it
+    responses={200: {
+        'description': 'Successful response',
+        'content': {'application/json': {'schema': ProveResponseSchema}},
+    }},
+)
 def prove(json_data):
     """
     Verifica e prova a equivalencia entre duas proposicoes logicas.
@@ -46,8 +54,13 @@ def prove(json_data):
             errors=[result.error] if result.error else None
         ).to_tuple()
 
-    # Return the prove data directly (matches ProveResponseSchema)
-    return result.value
+    # The truth table has 2**n rows: stream the body instead of building it
+    # in memory (the data already matches ProveResponseSchema). iter_json
+    # serializes the head before returning, so its errors are not a 200
+    return Response(
+        stream_with_context(ProveService.iter_json(result.value)),
+        mimetype='application/json'
+    )
 
 
 @prover_bp.get('/syntax')
@@ -1,11 +1,15 @@
 """Servico de prova de equivalencia logica."""
 import re
+from itertools import islice, repeat
 from typing import Any
 
+from flask import current_app
+
 from utils.proposition import (
     Proposition, CompoundProposition,
-    parse_proposition, ParseError
+    parse_proposition, ParseError, truth_table_bits
 )
+from utils.proposition.evaluator import row_count, full_mask, column_mask, unpack_bits, node_bits
 from utils.proposition import OperatorNode, AtomicNode
 from utils.equivalence import Equivalence
 from utils.nn import TransformationPredictor, generate_dataset
@@ -44,58 +48,35 @@ def _load_models():
     return _convergence_model, _simplification_model, _equivalence
 
 
-def _evaluate_proposition(prop):
-    """Avalia uma proposicao."""
-    if hasattr(prop, 'is_constant') and prop.is_constant():
-        return prop.is_true()
-    if isinstance(prop, Proposition):
-        return prop.value
-    elif isinstance(prop, CompoundProposition):
-        return prop.calculate_value()
-    return prop.value
-
-
-def _verify_semantic_equivalence(prop1, props1, prop2, props2):
-    """Verifica se duas proposicoes sao semanticamente equivalentes."""
-    all_names = set(props1.keys()) | set(props2.keys())
+def _build_var_context(props1, props2):
+    """Lista ordenada das variaveis das duas proposicoes (sem T e F)."""
+    all_names = props1.keys() | props2.keys()
     all_names.discard('T')
     all_names.discard('F')
-    n = len(all_names)
-    names = sorted(all_names)
+    return sorted(all_names)
 
-    if n == 0:
-        return _evaluate_proposition(prop1) == _evaluate_proposition(prop2)
 
-    for i in range(2 ** n):
-        for j, name in enumerate(names):
-            value = bool((i >> j) & 1)
-            if name in props1:
-                props1[name].value = value
-            if name in props2:
-                props2[name].value = value
-
-        val1 = _evaluate_proposition(prop1)
-        val2 = _evaluate_proposition(prop2)
+def _verify_semantic_equivalence(prop1, prop2, names):
+    """Verifica se duas proposicoes sao semanticamente equivalentes."""
+    # Cada bit e uma linha da tabela verdade: uma comparacao cobre todas
+    return truth_table_bits(prop1, names) == truth_table_bits(prop2, names)
 
-        if val1 != val2:
-            return False
 
-    return True
+# Atomos como no tokenizador: comecam por letra (inclusive acentuada) e
+# seguem com letras, digitos ou '_'
+_NEGATED_ATOM_RE = re.compile(r'[~!¬]\s*([^\W\d_]\w*)')
 
 
 def _detect_negations(prop_str, variables):
     """Detecta quais variaveis aparecem negadas na proposicao."""
-    negated = set()
-    for var in variables:
-        if re.search(rf'[~!¬]\s*{re.escape(var)}(?![a-zA-Z0-9])', prop_str):
-            negated.add(var)
-    return negated
+    # Uma unica varredura da string, em vez de uma busca por variavel
+    return set(_NEGATED_ATOM_RE.findall(prop_str)).intersection(variables)
 
 
 def _extract_subexpressions(prop):
     """Extrai todas as subexpressoes de uma proposicao composta."""
-    subexpressions = []
-    visited = set()
+    # sub_str -> (sub_prop, depth); a ordem de insercao e a ordem pos-fixada
+    visited = {}
 
     def _node_to_compound(node):
         if node is None:
@@ -106,129 +87,164 @@ def _extract_subexpressions(prop):
         return cp
 
     def _traverse(node, depth=0):
-        if node is None:
-            return
-
+        """Percorre a arvore de baixo para cima e retorna a string do no."""
         if isinstance(node, AtomicNode):
-            return
-
-        if isinstance(node, OperatorNode):
-            if node.left:
-                _traverse(node.left, depth + 1)
-            if node.right:
-                _traverse(node.right, depth + 1)
-
-            sub_prop = _node_to_compound(node)
-            sub_str = str(sub_prop)
-
-            if sub_str not in visited:
-                op_count = (
-                    sub_str.count('∧') + sub_str.count('^') +
-                    sub_str.count('∨') + sub_str.count('v') +
-                    sub_str.count('→') +
-                    sub_str.count('¬')
-                )
-                if op_count >= 1 and node.right is not None:
-                    visited.add(sub_str)
-                    subexpressions.append((sub_prop, sub_str, depth))
-
-    if isinstance(prop, CompoundProposition) and prop.root:
-        _traverse(prop.root)
+            return str(node)
 
-    subexpressions.sort(key=lambda x: -x[2])
+        # Reaproveita as strings dos filhos em vez de re-serializar a subarvore
+        left_str = _traverse(node.left, depth + 1)
+        if node.right is None:
+            return f"({node.operator}{left_str})"
+        right_str = _traverse(node.right, depth + 1)
+        sub_str = f"({left_str} {node.operator} {right_str})"
+
+        # Todo no binario ja contem ao menos um operador
+        if sub_str not in visited:
+            visited[sub_str] = (_node_to_compound(node), depth)
+
+        return sub_str
 
-    prop_str = str(prop)
-    subexpressions = [(sp, ss, d) for sp, ss, d in subexpressions if ss != prop_str]
+    if isinstance(prop, CompoundProposition) and isinstance(prop.root, OperatorNode):
+        # A proposicao inteira nao e listada como subexpressao
+        visited.pop(_traverse(prop.root), None)
+
+    subexpressions = [(sp, ss, d) for ss, (sp, d) in visited.items()]
+    subexpressions.sort(key=lambda x: -x[2])
 
     return subexpressions
 
 
-def _generate_truth_table(prop1, props1, prop2, props2):
-    """Gera a tabela verdade para ambas as proposicoes."""
-    all_names = set(props1.keys()) | set(props2.keys())
-    all_names.discard('T')
-    all_names.discard('F')
-    names = sorted(all_names)
+def _generate_truth_table(prop1, prop2, names):
+    """
+    Gera a tabela verdade para ambas as proposicoes.
+
+    A tabela e guardada por colunas: cada coluna e um inteiro cujo bit i
+    e o valor da coluna na linha i (ver truth_table_bits). As linhas so
+    sao montadas em _truth_table_rows, na serializacao da resposta.
+    """
     n = len(names)
 
+    table = {
+        'variables': [],
+        'subexpressions_p1': [],
+        'subexpressions_p2': [],
+        'num_rows': row_count(n),
+        'value_columns': [],
+        'subvalue_columns_p1': [],
+        'subvalue_columns_p2': [],
+        'p1': truth_table_bits(prop1, names),
+        'p2': truth_table_bits(prop2, names),
+    }
+
     if n == 0:
-        val1 = _evaluate_proposition(prop1)
-        val2 = _evaluate_proposition(prop2)
-        return {
-            'variables': [],
-            'subexpressions_p1': [],
-            'subexpressions_p2': [],
-            'rows': [{
-                'values': {},
-                'subvalues_p1': {},
-                'subvalues_p2': {},
-                'p1': val1,
-                'p2': val2
-            }]
-        }
+        return table
 
     prop1_str = str(prop1)
     prop2_str = str(prop2)
     negated = _detect_negations(prop1_str, names) | _detect_negations(prop2_str, names)
 
-    columns = []
-    for name in names:
-        columns.append(name)
+    full = full_mask(n)
+    for j, name in enumerate(names):
+        bits = column_mask(j, n)
+        table['value_columns'].append((name, bits))
         if name in negated:
-            columns.append(f'~{name}')
-
-    subexpr_p1 = _extract_subexpressions(prop1)
-    subexpr_p2 = _extract_subexpressions(prop2)
-
-    subexpr_p1_strs = [ss for _, ss, _ in subexpr_p1]
-    subexpr_p2_strs = [ss for _, ss, _ in subexpr_p2]
-
-    rows = []
-    for i in range(2 ** n):
-        values = {}
-        for j, name in enumerate(names):
-            value = bool((i >> j) & 1)
-            values[name] = value
-            if name in negated:
-                values[f'~{name}'] = not value
-            if name in props1:
-                props1[name].value = value
-            if name in props2:
-                props2[name].value = value
-
-        subvalues_p1 = {}
-        for sp, ss, _ in subexpr_p1:
-            try:
-                subvalues_p1[ss] = _evaluate_proposition(sp)
-            except:
-                subvalues_p1[ss] = None
-
-        subvalues_p2 = {}
-        for sp, ss, _ in subexpr_p2:
-            try:
-                subvalues_p2[ss] = _evaluate_proposition(sp)
-            except:
-                subvalues_p2[ss] = None
-
-        val1 = _evaluate_proposition(prop1)
-        val2 = _evaluate_proposition(prop2)
-
-        rows.append({
-            'values': values,
-            'subvalues_p1': subvalues_p1,
-            'subvalues_p2': subvalues_p2,
-            'p1': val1,
-            'p2': val2
-        })
+            table['value_columns'].append((f'~{name}', full ^ bits))
+    table['variables'] = [name for name, _ in table['value_columns']]
+
+    # Um unico percurso por proposicao avalia todas as subexpressoes
+    bits_p1 = node_bits(prop1, names)
+    for sp, ss, _ in _extract_subexpressions(prop1):
+        table['subexpressions_p1'].append(ss)
+        table['subvalue_columns_p1'].append((ss, bits_p1[id(sp.root)]))
+
+    bits_p2 = node_bits(prop2, names)
+    for sp, ss, _ in _extract_subexpressions(prop2):
+        table['subexpressions_p2'].append(ss)
+        table['subvalue_columns_p2'].append((ss, bits_p2[id(sp.root)]))
+
+    return table
+
+
+def _column_rows(columns, num_rows):
+    """Transpoe colunas (nome, bits) em tuplas de valores, uma por linha."""
+    if not columns:
+        return repeat((), num_rows)
+    return zip(*(unpack_bits(bits, num_rows) for _, bits in columns))
+
+
+def _truth_table_rows(table):
+    """Gera as linhas da tabela verdade a partir das colunas, uma por vez."""
+    num_rows = table['num_rows']
+    value_names = [name for name, _ in table['value_columns']]
+    sub_names_p1 = [ss for ss, _ in table['subvalue_columns_p1']]
+    sub_names_p2 = [ss for ss, _ in table['subvalue_columns_p2']]
+
+    # Cada coluna e desempacotada uma unica vez, sem deslocar bit a bit
+    rows = zip(
+        _column_rows(table['value_columns'], num_rows),
+        _column_rows(table['subvalue_columns_p1'], num_rows),
+        _column_rows(table['subvalue_columns_p2'], num_rows),
+        unpack_bits(table['p1'], num_rows),
+        unpack_bits(table['p2'], num_rows),
+    )
+    for values, subvalues_p1, subvalues_p2, p1, p2 in rows:
+        yield {
+            'values': dict(zip(value_names, values)),
+            'subvalues_p1': dict(zip(sub_names_p1, subvalues_p1)),
+            'subvalues_p2': dict(zip(sub_names_p2, subvalues_p2)),
+            'p1': p1,
+            'p2': p2,
+        }
+
 
+def _serialize_truth_table(table):
+    """Formata a tabela verdade para a resposta da API (ver TruthTableSchema)."""
     return {
-        'variables': columns,
-        'subexpressions_p1': subexpr_p1_strs,
-        'subexpressions_p2': subexpr_p2_strs,
-        'rows': rows
+        'variables': table['variables'],
+        'subexpressions_p1': table['subexpressions_p1'],
+        'subexpressions_p2': table['subexpressions_p2'],
+        'rows': _truth_table_rows(table),
     }
 
 
+# Linhas da tabela verdade serializadas por pedaco da resposta
+_ROWS_PER_CHUNK = 256
+
+
+def _iter_json(data):
+    """
+    Serializa a resposta da prova em pedacos de JSON.
+
+    O cabecalho e serializado aqui mesmo, antes de a resposta comecar; as
+    linhas da tabela verdade sao consumidas do gerador e escritas aos
+    poucos, entao a resposta inteira nunca fica montada em memoria.
+    Usa o provider JSON da aplicacao (current_app.json).
+    """
+    dumps = current_app.json.dumps
+    head = {key: value for key, value in data.items() if key != 'truth_table'}
+    table = {key: value for key, value in data['truth_table'].items() if key != 'rows'}
+
+    # Os dois objetos tem chaves, entao basta remover o '}' final de cada um
+    prefix = dumps(head)[:-1] + ',"truth_table":' + dumps(table)[:-1] + ',"rows":['
+    return _iter_rows(prefix, iter(data['truth_table']['rows']), dumps)
+
+
+def _iter_rows(prefix, rows, dumps):
+    """Gera o prefixo ja serializado e depois as linhas, em blocos."""
+    yield prefix
+
+    separator = ''
+    while True:
+        chunk = list(islice(rows, _ROWS_PER_CHUNK))
+        if not chunk:
+            break
+        # Um bloco e serializado como lista, sem os colchetes externos
+        yield separator + dumps(chunk)[1:-1]
+        separator = ','
+
+    yield ']}}'
+
+
 def _format_transformations(transformations):
     """Formata a lista de transformacoes para a resposta da API."""
     result = []
@@ -254,6 +270,11 @@ class ProveService:
         """Verifica se os modelos estao carregados."""
         return _convergence_model is not None
 
+    @staticmethod
+    def iter_json(data: dict):
+        """Gera o JSON da resposta de prove() em pedacos, para streaming."""
+        return _iter_json(data)
+
     @staticmethod
     def prove(data: dict) -> Result[dict[str, Any]]:
         """
@@ -297,9 +318,12 @@ class ProveService:
         prop1_initial = str(prop1)
         prop2_initial = str(prop2)
 
-        truth_table = _generate_truth_table(prop1, props1, prop2, props2)
+        # A verificacao semantica vem antes de montar a tabela: so compara
+        # P1 e P2, sem extrair nem avaliar subexpressoes
+        names = _build_var_context(props1, props2)
+        semantically_equivalent = _verify_semantic_equivalence(prop1, prop2, names)
 
-        semantically_equivalent = _verify_semantic_equivalence(prop1, props1, prop2, props2)
+        truth_table = _generate_truth_table(prop1, prop2, names)
 
         if not semantically_equivalent:
             return Result.success({
@@ -310,10 +334,10 @@ class ProveService:
                 'nn_predictions': 0,
                 'proposition1_initial': prop1_initial,
                 'proposition2_initial': prop2_initial,
-                'proposition1_final': str(prop1),
-                'proposition2_final': str(prop2),
+                'proposition1_final': prop1_initial,
+                'proposition2_final': prop2_initial,
                 'transformations': [],
-                'truth_table': truth_table,
+                'truth_table': _serialize_truth_table(truth_table),
                 'message': 'As proposicoes NAO sao equivalentes (tabelas verdade diferentes)'
             })
 
@@ -326,10 +350,10 @@ class ProveService:
                 'nn_predictions': 0,
                 'proposition1_initial': prop1_initial,
                 'proposition2_initial': prop2_initial,
-                'proposition1_final': str(prop1),
-                'proposition2_final': str(prop2),
+                'proposition1_final': prop1_initial,
+                'proposition2_final': prop2_initial,
                 'transformations': [],
-                'truth_table': truth_table,
+                'truth_table': _serialize_truth_table(truth_table),
                 'message': 'As proposicoes ja sao sintaticamente iguais'
             })
 
@@ -398,6 +422,6 @@ class ProveService:
             'proposition1_final': str(result.get('prop1_final', prop1)),
             'proposition2_final': str(result.get('prop2_final', prop2)),
             'transformations': _format_transformations(transformations),
-            'truth_table': truth_table,
+            'truth_table': _serialize_truth_table(truth_table),
             'message': message
         })
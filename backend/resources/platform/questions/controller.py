@@ -3,7 +3,9 @@ from apiflask import APIBlueprint, Schema
 from apiflask.fields import String
 
 from resources.platform.questions.service import QuestionPlatformService
-from resources.platform.questions.schemas import QuestionQuerySchema, AnswerSubmitSchema
+from resources.platform.questions.schemas import (
+    QuestionQuerySchema, AnswerSubmitSchema, ApprovedAnswersQuerySchema
+)
 from utils.response import ApiResponse
 # from utils.auth import require_student, get_current_student_id
 
@@ -68,11 +70,30 @@ def submit_answer(question_id, json_data):
 
 
 @questions_bp.get('/<question_id>/approved-answers')
+@questions_bp.input(ApprovedAnswersQuerySchema, location='query')
 @questions_bp.doc(tags=['Platform Questions'], summary='Get approved answers for question')
 #@required_student
-def get_approved_answers(question_id):
+def get_approved_answers(question_id, query_data):
     """Obtem respostas aprovadas para uma questao."""
-    result = QuestionPlatformService.get_approved_answers(question_id)
+    result = QuestionPlatformService.get_approved_answers(
+        question_id,
+        limit=query_data.get('limit'),
+        offset=query_data.get('offset', 0),
+        include_latex=query_data.get('include_latex', True)
+    )
+
+    return ApiResponse.ok(data=result.value).to_tuple()
+
+
+@questions_bp.get('/<question_id>/approved-answers/<answer_id>/latex')
+@questions_bp.doc(tags=['Platform Questions'], summary='Get LaTeX of an approved answer')
+#@required_student
+def get_approved_answer_latex(question_id, answer_id):
+    """Obtem o LaTeX de uma resposta aprovada."""
+    result = QuestionPlatformService.get_approved_answer_latex(question_id, answer_id)
+
+    if result.is_failure:
+        return ApiResponse.not_found(message=result.message).to_tuple()
 
     return ApiResponse.ok(data=result.value).to_tuple()
 
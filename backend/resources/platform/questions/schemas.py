@@ -1,7 +1,7 @@
 """Schemas for platform questions endpoints."""
 from apiflask import Schema
-from apiflask.fields import String
-from apiflask.validators import OneOf, Length
+from apiflask.fields import String, Integer, Boolean
+from apiflask.validators import OneOf, Length, Range
 
 
 class QuestionQuerySchema(Schema):
@@ -16,3 +16,10 @@ class AnswerSubmitSchema(Schema):
     """Schema for submitting an answer."""
     content = String(required=True, validate=Length(min=1))
     content_latex = String(load_default=None)
+
+
+class ApprovedAnswersQuerySchema(Schema):
+    """Schema for paginating approved answers."""
+    limit = Integer(load_default=None, validate=Range(min=1, max=100))
+    offset = Integer(load_default=0, validate=Range(min=0))
+    include_latex = Boolean(load_default=True)
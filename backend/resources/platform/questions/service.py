@@ -2,79 +2,237 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, func, bindparam
+from sqlalchemy.orm import defer, joinedload
 
 from app.extensions import db
-from models import Question, MathArea, MathSubarea, Answer
+from models import Question, MathArea, MathSubarea, Answer, Student
 from models.enums import QuestionDifficulty, AnswerStatus
+from utils.cache import TTLCache, cache, MATH_AREAS_CACHE_KEY, subareas_cache_key
 from utils.response import Result
 
 
+# Difficulty filter values accepted by list_questions
+_DIFFICULTY_MAP = {
+    'facil': QuestionDifficulty.EASY,
+    'medio': QuestionDifficulty.MEDIUM,
+    'dificil': QuestionDifficulty.HARD,
+    'especialista': QuestionDifficulty.EXPERT,
+}
+
+# Enum member -> serialized value, read per row by the serializers
+# (.get(None) is None, like the old "x.value if x else None")
+_DIFFICULTY_VALUES = {difficulty: difficulty.value for difficulty in QuestionDifficulty}
+_STATUS_VALUES = {status: status.value for status in AnswerStatus}
+
+# Math areas and subareas change rarely: the cached lists are invalidated
+# by MathAreaService on every write and otherwise expire after 5 minutes
+_TAXONOMY_CACHE_TIMEOUT = 300
+
+# Serialized questions are keyed by the very fields they are built from, so
+# the timeout only bounds how long unused versions stay in memory
+_QUESTION_CACHE_TIMEOUT = 600
+
+# Serialized questions live in their own cache, so listing many questions
+# never pushes the taxonomy lists out of the shared one
+_QUESTION_CACHE_SIZE = 8192
+_question_cache = TTLCache(default_timeout=_QUESTION_CACHE_TIMEOUT, max_entries=_QUESTION_CACHE_SIZE)
+
+# Hot lookups built once, with bound parameters given at execute time
+_ACTIVE_QUESTION_BY_ID = select(Question).where(
+    Question.id == bindparam('question_id'),
+    Question.active == True
+)
+_ANSWER_BY_QUESTION_STUDENT = select(Answer).where(
+    Answer.question_id == bindparam('question_id'),
+    Answer.student_id == bindparam('student_id')
+)
+_APPROVED_ANSWERS_COUNT = select(func.count(Answer.id)).where(
+    Answer.question_id == bindparam('question_id'),
+    Answer.status == AnswerStatus.APPROVED
+)
+
+# Columns read by list_questions: plain rows, without ORM objects. The
+# labels match the keys of QuestionPlatformService._question_fields
+_QUESTION_LIST_COLUMNS = (
+    Question.id,
+    Question.math_area_id,
+    Question.math_subarea_id,
+    Question.title,
+    Question.content,
+    Question.content_latex,
+    Question.difficulty,
+    Question.tags,
+    Question.created_at,
+    MathArea.name.label('math_area_name'),
+    MathSubarea.name.label('math_subarea_name'),
+)
+
+
+def warm_up_queries() -> None:
+    """
+    Execute the hot lookups once so their compiled SQL is already cached.
+
+    Uses IDs that match no row; meant to run at startup, inside an app
+    context, so the first requests do not pay the compilation.
+    """
+    db.session.execute(_ACTIVE_QUESTION_BY_ID, {'question_id': ''}).all()
+    db.session.execute(_ANSWER_BY_QUESTION_STUDENT, {'question_id': '', 'student_id': ''}).all()
+    db.session.execute(_APPROVED_ANSWERS_COUNT, {'question_id': ''}).all()
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """ISO 8601 string of a datetime, or None."""
+    return None if value is None else value.isoformat()
+
+
 class QuestionPlatformService:
     """Service for students to view questions and submit answers."""
 
     @staticmethod
-    def _serialize_question(question: Question, student_id: Optional[str] = None) -> dict:
-        """Serialize a question to dictionary."""
-        data = {
-            'id': str(question.id),
-            'math_area_id': str(question.math_area_id),
-            'math_area_name': question.math_area.name if question.math_area else None,
-            'math_subarea_id': str(question.math_subarea_id) if question.math_subarea_id else None,
-            'math_subarea_name': question.math_subarea.name if question.math_subarea else None,
+    def _question_fields(question: Question) -> dict:
+        """Flatten a question and its area/subarea into the list_questions columns."""
+        math_area = question.math_area
+        math_subarea = question.math_subarea
+        return {
+            'id': question.id,
+            'math_area_id': question.math_area_id,
+            'math_subarea_id': question.math_subarea_id,
             'title': question.title,
             'content': question.content,
             'content_latex': question.content_latex,
-            'difficulty': question.difficulty.value if question.difficulty else None,
-            'tags': question.tags or [],
-            'created_at': question.created_at.isoformat() if question.created_at else None,
+            'difficulty': question.difficulty,
+            'tags': question.tags,
+            'created_at': question.created_at,
+            'math_area_name': math_area.name if math_area else None,
+            'math_subarea_name': math_subarea.name if math_subarea else None,
         }
 
-        # Check if student has answered this question
-        if student_id:
-            stmt = select(Answer).where(
-                Answer.question_id == question.id,
-                Answer.student_id == student_id
-            )
-            result = db.session.execute(stmt)
-            answer = result.scalar_one_or_none()
-            if answer:
-                data['my_answer'] = {
-                    'id': str(answer.id),
-                    'content': answer.content,
-                    'content_latex': answer.content_latex,
-                    'status': answer.status.value if answer.status else None,
-                    'is_correct': answer.is_correct,
-                    'feedback': answer.feedback,
-                    'score': answer.score,
-                    'created_at': answer.created_at.isoformat() if answer.created_at else None,
-                }
-            else:
-                data['my_answer'] = None
+    @staticmethod
+    def _serialize_question_core(fields) -> dict:
+        """
+        Serialize the student-independent fields of a question.
 
-        # Get count of approved answers
-        stmt = select(Answer).where(
-            Answer.question_id == question.id,
-            Answer.status == AnswerStatus.APPROVED
+        Args:
+            fields: Mapping with the list_questions columns (a result row
+                or the output of _question_fields)
+
+        The result is cached by the values of the serialized fields
+        themselves, so any edit to them changes the key, even two edits
+        within the same second of the update timestamps.
+        """
+        question_id = fields['id']
+        math_subarea_id = fields['math_subarea_id']
+        tags = fields['tags']
+        cache_key = (
+            question_id,
+            fields['math_area_id'],
+            fields['math_area_name'],
+            math_subarea_id,
+            fields['math_subarea_name'],
+            fields['title'],
+            fields['content'],
+            fields['content_latex'],
+            fields['difficulty'],
+            tuple(tags) if tags else (),
+            fields['created_at'],
         )
-        result = db.session.execute(stmt)
-        approved_answers = result.scalars().all()
-        data['approved_answers_count'] = len(approved_answers)
+        data = _question_cache.get(cache_key)
+        if data is not None:
+            return data
+
+        data = {
+            'id': str(question_id),
+            'math_area_id': str(fields['math_area_id']),
+            'math_area_name': fields['math_area_name'],
+            'math_subarea_id': str(math_subarea_id) if math_subarea_id else None,
+            'math_subarea_name': fields['math_subarea_name'],
+            'title': fields['title'],
+            'content': fields['content'],
+            'content_latex': fields['content_latex'],
+            'difficulty': _DIFFICULTY_VALUES.get(fields['difficulty']),
+            'tags': fields['tags'] or [],
+            'created_at': _iso(fields['created_at']),
+        }
 
+        _question_cache.set(cache_key, data)
         return data
 
     @staticmethod
-    def _serialize_answer(answer: Answer) -> dict:
-        """Serialize an approved answer for public view."""
+    def _serialize_question(
+        fields,
+        student_id: Optional[str] = None,
+        my_answers: Optional[dict] = None,
+        approved_counts: Optional[dict] = None
+    ) -> dict:
+        """
+        Serialize a question to dictionary.
+
+        Args:
+            fields: Question columns (see _serialize_question_core)
+            student_id: ID of the student, to include the student's answer
+            my_answers: Pre-fetched student answers by question ID
+            approved_counts: Pre-fetched approved answer counts by question ID
+        """
+        question_id = fields['id']
+        core = QuestionPlatformService._serialize_question_core(fields)
+
+        # Get count of approved answers
+        if approved_counts is not None:
+            approved_count = approved_counts.get(question_id, 0)
+        else:
+            result = db.session.execute(_APPROVED_ANSWERS_COUNT, {'question_id': question_id})
+            approved_count = result.scalar() or 0
+
+        if not student_id:
+            # New dict: the core one is shared through the cache
+            return {**core, 'approved_answers_count': approved_count}
+
+        # Check if student has answered this question
+        if my_answers is not None:
+            answer = my_answers.get(question_id)
+        else:
+            result = db.session.execute(
+                _ANSWER_BY_QUESTION_STUDENT,
+                {'question_id': question_id, 'student_id': student_id}
+            )
+            answer = result.scalar_one_or_none()
+
+        return {
+            **core,
+            'my_answer': QuestionPlatformService._serialize_my_answer(answer) if answer else None,
+            'approved_answers_count': approved_count,
+        }
+
+    @staticmethod
+    def _serialize_my_answer(answer: Answer) -> dict:
+        """Serialize the student's own answer to a question."""
         return {
             'id': str(answer.id),
-            'student_name': answer.student.name if answer.student else 'Anonimo',
             'content': answer.content,
             'content_latex': answer.content_latex,
+            'status': _STATUS_VALUES.get(answer.status),
+            'is_correct': answer.is_correct,
+            'feedback': answer.feedback,
+            'score': answer.score,
+            'created_at': _iso(answer.created_at),
+        }
+
+    @staticmethod
+    def _serialize_answer(answer: Answer, include_latex: bool = True) -> dict:
+        """Serialize an approved answer for public view."""
+        student = answer.student
+        data = {
+            'id': str(answer.id),
+            'student_name': student.name if student else 'Anonimo',
+            'content': answer.content,
             'is_correct': answer.is_correct,
             'score': answer.score,
-            'created_at': answer.created_at.isoformat() if answer.created_at else None,
+            'created_at': _iso(answer.created_at),
         }
+        if include_latex:
+            data['content_latex'] = answer.content_latex
+        return data
 
     @staticmethod
     def list_questions(
@@ -97,7 +255,13 @@ class QuestionPlatformService:
         Returns:
             Result containing list of questions
         """
-        stmt = select(Question).where(Question.active == True)
+        # Plain rows with the area names joined in: no ORM objects or lazy loads
+        stmt = (
+            select(*_QUESTION_LIST_COLUMNS)
+            .outerjoin(MathArea, Question.math_area_id == MathArea.id)
+            .outerjoin(MathSubarea, Question.math_subarea_id == MathSubarea.id)
+            .where(Question.active == True)
+        )
 
         if math_area_id:
             stmt = stmt.where(Question.math_area_id == math_area_id)
@@ -105,29 +269,48 @@ class QuestionPlatformService:
         if math_subarea_id:
             stmt = stmt.where(Question.math_subarea_id == math_subarea_id)
 
-        if difficulty:
-            difficulty_map = {
-                'facil': QuestionDifficulty.EASY,
-                'medio': QuestionDifficulty.MEDIUM,
-                'dificil': QuestionDifficulty.HARD,
-                'especialista': QuestionDifficulty.EXPERT,
-            }
-            if difficulty in difficulty_map:
-                stmt = stmt.where(Question.difficulty == difficulty_map[difficulty])
+        mapped_difficulty = _DIFFICULTY_MAP.get(difficulty) if difficulty else None
+        if mapped_difficulty is not None:
+            stmt = stmt.where(Question.difficulty == mapped_difficulty)
 
+        params = {}
         if search:
             stmt = stmt.where(
-                Question.title.ilike(f'%{search}%') |
-                Question.content.ilike(f'%{search}%')
+                Question.title.ilike(bindparam('search')) |
+                Question.content.ilike(bindparam('search'))
             )
+            params['search'] = f'%{search}%'
 
         stmt = stmt.order_by(Question.created_at.desc())
 
-        result = db.session.execute(stmt)
-        questions = result.scalars().all()
+        result = db.session.execute(stmt, params)
+        rows = result.mappings().all()
+
+        # Fetch answers and counts for all questions at once instead of per question
+        question_ids = [row['id'] for row in rows]
+        my_answers = {}
+        approved_counts = {}
+        if question_ids:
+            if student_id:
+                stmt = select(Answer).where(
+                    Answer.question_id.in_(question_ids),
+                    Answer.student_id == student_id
+                )
+                my_answers = {a.question_id: a for a in db.session.execute(stmt).scalars()}
+
+            stmt = select(Answer.question_id, func.count(Answer.id)).where(
+                Answer.question_id.in_(question_ids),
+                Answer.status == AnswerStatus.APPROVED
+            ).group_by(Answer.question_id)
+            approved_counts = dict(db.session.execute(stmt).all())
 
         return Result.success(
-            value=[QuestionPlatformService._serialize_question(q, student_id) for q in questions]
+            value=[
+                QuestionPlatformService._serialize_question(
+                    row, student_id, my_answers=my_answers, approved_counts=approved_counts
+                )
+                for row in rows
+            ]
         )
 
     @staticmethod
@@ -142,11 +325,7 @@ class QuestionPlatformService:
         Returns:
             Result containing question data
         """
-        stmt = select(Question).where(
-            Question.id == question_id,
-            Question.active == True
-        )
-        result = db.session.execute(stmt)
+        result = db.session.execute(_ACTIVE_QUESTION_BY_ID, {'question_id': question_id})
         question = result.scalar_one_or_none()
 
         if not question:
@@ -156,7 +335,9 @@ class QuestionPlatformService:
             )
 
         return Result.success(
-            value=QuestionPlatformService._serialize_question(question, student_id)
+            value=QuestionPlatformService._serialize_question(
+                QuestionPlatformService._question_fields(question), student_id
+            )
         )
 
     @staticmethod
@@ -172,26 +353,21 @@ class QuestionPlatformService:
         Returns:
             Result containing answer data
         """
-        # Verify question exists and is active
-        stmt = select(Question).where(
-            Question.id == question_id,
-            Question.active == True
-        )
-        result = db.session.execute(stmt)
-        question = result.scalar_one_or_none()
+        # Verify question exists and is active (primary key lookup, served
+        # from the session identity map when already loaded)
+        question = db.session.get(Question, question_id)
 
-        if not question:
+        if not question or not question.active:
             return Result.fail(
                 message="Questao nao encontrada",
                 code="NOT_FOUND"
             )
 
         # Check if student already answered
-        stmt = select(Answer).where(
-            Answer.question_id == question_id,
-            Answer.student_id == student_id
+        result = db.session.execute(
+            _ANSWER_BY_QUESTION_STUDENT,
+            {'question_id': question_id, 'student_id': student_id}
         )
-        result = db.session.execute(stmt)
         existing_answer = result.scalar_one_or_none()
 
         if existing_answer:
@@ -214,9 +390,9 @@ class QuestionPlatformService:
                     'id': str(existing_answer.id),
                     'content': existing_answer.content,
                     'content_latex': existing_answer.content_latex,
-                    'status': existing_answer.status.value,
-                    'created_at': existing_answer.created_at.isoformat() if existing_answer.created_at else None,
-                    'updated_at': existing_answer.updated_at.isoformat() if existing_answer.updated_at else None,
+                    'status': _STATUS_VALUES[existing_answer.status],
+                    'created_at': _iso(existing_answer.created_at),
+                    'updated_at': _iso(existing_answer.updated_at),
                 },
                 message="Resposta atualizada com sucesso"
             )
@@ -241,66 +417,124 @@ class QuestionPlatformService:
                     'id': str(answer.id),
                     'content': answer.content,
                     'content_latex': answer.content_latex,
-                    'status': answer.status.value,
-                    'created_at': answer.created_at.isoformat() if answer.created_at else None,
+                    'status': _STATUS_VALUES[answer.status],
+                    'created_at': _iso(answer.created_at),
                 },
                 message="Resposta enviada com sucesso"
             )
 
     @staticmethod
-    def get_approved_answers(question_id: str) -> Result[list]:
+    def get_approved_answers(
+        question_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_latex: bool = True
+    ) -> Result[list]:
         """
-        Get approved answers for a question.
+        Get approved answers for a question, newest first.
 
         Args:
             question_id: ID of the question
+            limit: Maximum number of answers (all if None)
+            offset: Number of answers to skip
+            include_latex: Whether to load and return content_latex; when
+                False the column is not fetched (see get_approved_answer_latex)
 
         Returns:
             Result containing list of approved answers
         """
-        stmt = select(Answer).where(
+        # The student's name is loaded in the same query (one JOIN instead of
+        # one lazy load per answer)
+        stmt = select(Answer).options(
+            joinedload(Answer.student).load_only(Student.name)
+        ).where(
             Answer.question_id == question_id,
             Answer.status == AnswerStatus.APPROVED
         ).order_by(Answer.created_at.desc())
 
+        if not include_latex:
+            stmt = stmt.options(defer(Answer.content_latex))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+
         result = db.session.execute(stmt)
         answers = result.scalars().all()
 
         return Result.success(
-            value=[QuestionPlatformService._serialize_answer(a) for a in answers]
+            value=[QuestionPlatformService._serialize_answer(a, include_latex) for a in answers]
         )
 
+    @staticmethod
+    def get_approved_answer_latex(question_id: str, answer_id: str) -> Result[dict]:
+        """
+        Get the LaTeX content of one approved answer.
+
+        Args:
+            question_id: ID of the question
+            answer_id: ID of the answer
+
+        Returns:
+            Result containing the answer ID and its content_latex
+        """
+        stmt = select(Answer.content_latex).where(
+            Answer.id == answer_id,
+            Answer.question_id == question_id,
+            Answer.status == AnswerStatus.APPROVED
+        )
+        row = db.session.execute(stmt).one_or_none()
+
+        if row is None:
+            return Result.fail(
+                message="Resposta nao encontrada",
+                code="NOT_FOUND"
+            )
+
+        return Result.success(value={'id': answer_id, 'content_latex': row.content_latex})
+
     @staticmethod
     def list_math_areas() -> Result[list]:
         """List active math areas for filtering."""
-        stmt = select(MathArea).where(MathArea.active == True).order_by(MathArea.order)
-        result = db.session.execute(stmt)
-        areas = result.scalars().all()
+        data = cache.get(MATH_AREAS_CACHE_KEY)
+        if data is not None:
+            return Result.success(value=data)
+
+        stmt = select(
+            MathArea.id, MathArea.name, MathArea.icon, MathArea.color
+        ).where(MathArea.active == True).order_by(MathArea.order)
+        rows = db.session.execute(stmt).mappings()
 
         data = [{
-            'id': str(area.id),
-            'name': area.name,
-            'icon': area.icon,
-            'color': area.color,
-        } for area in areas]
+            'id': str(row['id']),
+            'name': row['name'],
+            'icon': row['icon'],
+            'color': row['color'],
+        } for row in rows]
 
+        cache.set(MATH_AREAS_CACHE_KEY, data, timeout=_TAXONOMY_CACHE_TIMEOUT)
         return Result.success(value=data)
 
     @staticmethod
     def list_subareas(area_id: str) -> Result[list]:
         """List active subareas for a math area."""
-        stmt = select(MathSubarea).where(
+        cache_key = subareas_cache_key(area_id)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Result.success(value=data)
+
+        stmt = select(MathSubarea.id, MathSubarea.name).where(
             MathSubarea.math_area_id == area_id,
             MathSubarea.active == True
         ).order_by(MathSubarea.order)
-        result = db.session.execute(stmt)
-        subareas = result.scalars().all()
+        rows = db.session.execute(stmt).mappings()
 
         data = [{
-            'id': str(subarea.id),
-            'name': subarea.name,
-        } for subarea in subareas]
+            'id': str(row['id']),
+            'name': row['name'],
+        } for row in rows]
 
+        cache.set(cache_key, data, timeout=_TAXONOMY_CACHE_TIMEOUT)
         return Result.success(value=data)
 
     @staticmethod
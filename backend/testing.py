@@ -85,6 +85,14 @@ class TestDeMorgan(unittest.TestCase):
         # Result should be (~p ^ ~q)
         self.assertEqual(str(result), '((¬p) ^ (¬q))')
 
+    def test_apply_de_morgan_negated_operand(self):
+        # ~(~p ^ q) -> p v ~q (no double negation is built)
+        not_p = CompoundProposition(Proposition.__invert__, self.p)
+        not_p_and_q = CompoundProposition(Proposition.__mul__, not_p, self.q)
+        negation = CompoundProposition(Proposition.__invert__, not_p_and_q)
+        result = self.eq.apply_de_morgan(negation)
+        self.assertEqual(str(result), '(p v (¬q))')
+
     def test_de_morgan_preserves_truth_value(self):
         # ~(p ^ q) should have same truth value as ~p v ~q
         p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
@@ -360,6 +368,107 @@ class TestSyntacticEquality(unittest.TestCase):
 
         self.assertTrue(self.eq.are_equal(outer1, outer2))
 
+    def test_empty_compound(self):
+        prop = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        self.assertTrue(self.eq.are_equal(CompoundProposition(), CompoundProposition()))
+        self.assertFalse(self.eq.are_equal(CompoundProposition(), prop))
+
+    def test_same_atoms_different_shape(self):
+        prop1 = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        prop2 = CompoundProposition(Proposition.__mul__, self.q, self.p)
+        self.assertFalse(self.eq.are_equal(prop1, prop2))
+
+
+class TestSemanticEquivalence(unittest.TestCase):
+    def setUp(self):
+        self.eq = Equivalence()
+        self.p = Proposition(text='p', value=True)
+        self.q = Proposition(text='q', value=False)
+
+    def test_de_morgan_is_equivalent(self):
+        # ~(p ^ q) = ~p v ~q
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        not_p_and_q = CompoundProposition(Proposition.__invert__, p_and_q)
+        not_p = CompoundProposition(Proposition.__invert__, self.p)
+        not_q = CompoundProposition(Proposition.__invert__, self.q)
+        not_p_or_not_q = CompoundProposition(Proposition.__add__, not_p, not_q)
+        self.assertTrue(self.eq.are_equivalent(not_p_and_q, not_p_or_not_q))
+
+    def test_different_truth_tables(self):
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        p_or_q = CompoundProposition(Proposition.__add__, self.p, self.q)
+        self.assertFalse(self.eq.are_equivalent(p_and_q, p_or_q))
+
+    def test_tautology_and_constant(self):
+        # p v ~p = T
+        not_p = CompoundProposition(Proposition.__invert__, self.p)
+        p_or_not_p = CompoundProposition(Proposition.__add__, self.p, not_p)
+        self.assertTrue(self.eq.are_equivalent(p_or_not_p, TRUE))
+        self.assertFalse(self.eq.are_equivalent(p_or_not_p, FALSE))
+
+    def test_fallback_stops_on_different_truth_tables(self):
+        # No strategy runs, so no predictor is needed
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        p_or_q = CompoundProposition(Proposition.__add__, self.p, self.q)
+        result = self.eq.prove_with_fallback(p_and_q, p_or_q, None)
+        self.assertFalse(result['success'])
+        self.assertEqual(result['method'], 'not_equivalent')
+        self.assertEqual(result['reason'], 'not_equivalent')
+        self.assertEqual(result['total_iterations'], 0)
+        self.assertEqual(str(result['prop1_final']), str(p_and_q))
+
+    def test_table_check_skipped_above_variable_cap(self):
+        # Past the cap the tables are not built, even when they differ
+        atoms = [Proposition(text=f'a{i}', value=True) for i in range(17)]
+        conj = atoms[0]
+        for atom in atoms[1:]:
+            conj = CompoundProposition(Proposition.__mul__, conj, atom)
+        disj = CompoundProposition(Proposition.__add__, conj, self.q)
+        self.assertFalse(self.eq._tables_differ(conj, disj))
+
+
+class TestApplicableLaws(unittest.TestCase):
+    def setUp(self):
+        self.eq = Equivalence()
+        self.p = Proposition(text='p', value=True)
+        self.q = Proposition(text='q', value=False)
+
+    def test_double_negation_only(self):
+        not_p = CompoundProposition(Proposition.__invert__, self.p)
+        not_not_p = CompoundProposition(Proposition.__invert__, not_p)
+        self.assertEqual(self.eq.applicable_laws(not_not_p), ['double_negation'])
+
+    def test_matches_check_methods(self):
+        not_p = CompoundProposition(Proposition.__invert__, self.p)
+        props = [
+            CompoundProposition(Proposition.__add__, self.p, not_p),
+            CompoundProposition(Proposition.__mul__, self.p, TRUE),
+            CompoundProposition(Proposition.__rshift__, self.p, FALSE),
+            CompoundProposition(Proposition.__add__, not_p, self.q),
+        ]
+        laws = [
+            'double_negation', 'de_morgan', 'de_morgan_reverse', 'commutativity',
+            'associativity', 'idempotence', 'absorption', 'distributivity',
+            'factoring', 'implication_elimination', 'implication_introduction',
+            'contraposition', 'identity', 'domination', 'negation_constant',
+            'complement', 'implication_constant',
+        ]
+        for prop in props:
+            expected = {law for law in laws if getattr(self.eq, 'check_' + law)(prop)}
+            self.assertEqual(set(self.eq.applicable_laws(prop)), expected)
+
+    def test_atomic_proposition(self):
+        self.assertEqual(self.eq.applicable_laws(self.eq._ensure_compound(self.p)), [])
+
+    def test_check_batch(self):
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        props = [
+            CompoundProposition(Proposition.__invert__, p_and_q),
+            p_and_q,
+            self.p,
+        ]
+        self.assertEqual(self.eq.check_batch('de_morgan', props), [True, False, False])
+
 
 class TestBruteForceProver(unittest.TestCase):
     def setUp(self):
@@ -444,6 +553,131 @@ class TestBruteForceProver(unittest.TestCase):
 
         self.assertLessEqual(result['iterations'], 10)
 
+    def test_repeated_proof_is_remembered(self):
+        """A proven pair is answered again from the memo, as a copy."""
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        q_and_p = CompoundProposition(Proposition.__mul__, self.q, self.p)
+        first = self.eq.prove_equivalence(p_and_q, q_and_p)
+        self.assertTrue(first['success'])
+        first['transformations'].clear()
+
+        again = self.eq.prove_equivalence(
+            CompoundProposition(Proposition.__mul__, self.p, self.q),
+            CompoundProposition(Proposition.__mul__, self.q, self.p),
+        )
+        self.assertTrue(again['success'])
+        self.assertEqual(again['iterations'], first['iterations'])
+        # Clearing the first result did not reach the remembered proof
+        self.assertTrue(again['transformations'])
+
+    def test_without_strings(self):
+        """record_strings=False leaves the texts out of the log."""
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        q_and_p = CompoundProposition(Proposition.__mul__, self.q, self.p)
+        result = self.eq.prove_equivalence(p_and_q, q_and_p, record_strings=False)
+        self.assertTrue(result['success'])
+        self.assertTrue(result['transformations'])
+        for t in result['transformations']:
+            self.assertNotIn('result', t)
+            self.assertNotIn('p1', t)
+            self.assertIn('law', t)
+
+    def test_simplification_without_strings(self):
+        """prove_simplification_nn also logs without texts on request."""
+        class ComplementPredictor:
+            def predict(self, prop, goal='F'):
+                return 'complement'
+
+        not_p = CompoundProposition(Proposition.__invert__, self.p)
+        contradiction = CompoundProposition(Proposition.__mul__, self.p, not_p)
+        result = self.eq.prove_simplification_nn(
+            contradiction, 'F', ComplementPredictor(), record_strings=False
+        )
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['transformations']), 1)
+        step = result['transformations'][0]
+        self.assertNotIn('result', step)
+        self.assertTrue(step['result_prop'].is_false())
+
+    def test_rewind_side(self):
+        """Rewinding a side drops its later steps and pins its form."""
+        log = [
+            {'proposition': 2, 'p1': 'a', 'p2': 'b1'},
+            {'proposition': 2, 'p1': 'a', 'p2': 'b2'},
+            {'proposition': 1, 'p1': 'a1', 'p2': 'b2'},
+        ]
+        rewound = self.eq._rewind_side(log, 2, 1, 'b1')
+        self.assertEqual(rewound, [
+            {'proposition': 2, 'p1': 'a', 'p2': 'b1'},
+            {'proposition': 1, 'p1': 'a1', 'p2': 'b1'},
+        ])
+
+    def test_prediction_asked_once_per_pair(self):
+        """A pair seen again during a proof reuses its prediction."""
+        class CountingPredictor:
+            calls = 0
+
+            def predict(self, prop1, prop2):
+                self.calls += 1
+                return 1, 'commutativity'
+
+        predictor = CountingPredictor()
+        predictions = {}
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        q_and_p = CompoundProposition(Proposition.__mul__, self.q, self.p)
+        self.eq._predict_pair(predictor, predictions, p_and_q, q_and_p)
+        again = self.eq._predict_pair(
+            predictor, predictions,
+            CompoundProposition(Proposition.__mul__, self.p, self.q), q_and_p,
+        )
+        self.assertEqual(again, (1, 'commutativity'))
+        self.assertEqual(predictor.calls, 1)
+        self.eq._predict_pair(predictor, predictions, q_and_p, p_and_q)
+        self.assertEqual(predictor.calls, 2)
+
+    def test_prediction_asked_once_per_form(self):
+        """A form seen again during a simplification reuses its prediction."""
+        class CountingPredictor:
+            calls = 0
+
+            def predict(self, prop, goal='F'):
+                self.calls += 1
+                return 'complement'
+
+        predictor = CountingPredictor()
+        predictions = {}
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        self.eq._predict_form(predictor, predictions, p_and_q, 'F')
+        again = self.eq._predict_form(
+            predictor, predictions,
+            CompoundProposition(Proposition.__mul__, self.p, self.q), 'F',
+        )
+        self.assertEqual(again, 'complement')
+        self.assertEqual(predictor.calls, 1)
+
+    def test_failed_shortcut_probed_once(self):
+        """optimize_proof does not search again a pair that already failed."""
+        class CountingPredictor:
+            calls = 0
+
+            def predict(self, prop1, prop2):
+                self.calls += 1
+                return 1, 'commutativity'
+
+        predictor = CountingPredictor()
+        probes = {}
+        r = Proposition(text='r', value=True)
+        p_and_q = CompoundProposition(Proposition.__mul__, self.p, self.q)
+        q_and_r = CompoundProposition(Proposition.__mul__, self.q, r)
+        first = self.eq._probe_shortcut(probes, p_and_q, q_and_r, predictor, 1)
+        self.assertFalse(first['success'])
+        again = self.eq._probe_shortcut(
+            probes, CompoundProposition(Proposition.__mul__, self.p, self.q),
+            q_and_r, predictor, 1,
+        )
+        self.assertIs(again, first)
+        self.assertEqual(predictor.calls, 1)
+
 
 class TestNeuralNetworkFeatures(unittest.TestCase):
     """Test feature extraction for neural network."""
@@ -686,6 +920,16 @@ class TestParser(unittest.TestCase):
         # There should be only one 'p' in the dict
         self.assertEqual(len(props), 1)
 
+    def test_repeated_parse_is_independent(self):
+        """Parsing the same text twice should not share propositions."""
+        prop1, props1 = parse_proposition("(p ^ q) -> p")
+        prop2, props2 = parse_proposition("(p ^ q) -> p")
+        self.assertEqual(str(prop1), str(prop2))
+        self.assertIsNot(props1['p'], props2['p'])
+        props1['p'].value = True
+        self.assertFalse(props2['p'].value)
+        self.assertIs(prop2.root.right.proposition, props2['p'])
+
     def test_parse_implication(self):
         """Should parse implication with ->."""
         prop, props = parse_proposition("p -> q")
@@ -1054,5 +1298,40 @@ class TestImplicationEquivalence(unittest.TestCase):
                 self.assertEqual(impl.calculate_value(), result.calculate_value())
 
 
+class TestTruthTableBits(unittest.TestCase):
+    """Test bit-parallel truth table evaluation."""
+
+    def test_implication_bits(self):
+        """Row i sets names[j] to (i >> j) & 1."""
+        from utils.proposition import truth_table_bits
+        prop, _ = parse_proposition("p -> q")
+        self.assertEqual(truth_table_bits(prop, ['p', 'q']), 0b1101)
+
+    def test_bits_match_calculate_value(self):
+        """Each bit should match evaluating the row one by one."""
+        from utils.proposition import truth_table_bits
+        prop, props = parse_proposition("~(p ^ q) v (r -> p)")
+        names = ['p', 'q', 'r']
+        bits = truth_table_bits(prop, names)
+        for i in range(2 ** len(names)):
+            for j, name in enumerate(names):
+                props[name].value = bool((i >> j) & 1)
+            self.assertEqual(bool((bits >> i) & 1), prop.calculate_value())
+
+    def test_constants(self):
+        """T is set on every row and F on none."""
+        from utils.proposition import truth_table_bits
+        self.assertEqual(truth_table_bits(TRUE, ['p', 'q']), 0b1111)
+        self.assertEqual(truth_table_bits(FALSE, ['p', 'q']), 0)
+
+    def test_negation_column_of_accented_atom(self):
+        """Negated atoms with accents get their own column too."""
+        from resources.platform.prover.prove.service import _generate_truth_table
+        prop1, _ = parse_proposition("~ação v q")
+        prop2, _ = parse_proposition("ação -> q")
+        table = _generate_truth_table(prop1, prop2, ['ação', 'q'])
+        self.assertEqual(table['variables'], ['ação', '~ação', 'q'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,175 @@
+"""
+Shared core of the authentication decorators.
+
+utils.auth and utils.admin_auth build their decorators and getters from
+the factories below, so both share one implementation.
+"""
+from functools import update_wrapper
+from typing import Callable, Iterable, Optional, Tuple
+
+from flask import request, g
+from werkzeug.exceptions import Unauthorized, Forbidden
+
+from utils.jwt import verify_token
+
+
+_BEARER = 'Bearer '
+_BEARER_LEN = len(_BEARER)
+
+
+def get_token_from_header() -> Optional[str]:
+    """Extract JWT token from Authorization header."""
+    auth_header = request.headers.get('Authorization')
+
+    if not auth_header or auth_header[:_BEARER_LEN] != _BEARER:
+        return None
+
+    return auth_header[_BEARER_LEN:]  # Remove 'Bearer ' prefix
+
+
+def extract_and_verify(token_type: str = 'access', required_role: Optional[str] = None) -> dict:
+    """
+    Extract the token from the request and return its verified payload.
+
+    The payload is kept in Flask's g object, so decorators re-entered
+    within the same request do not verify the same token again.
+
+    Raises:
+        Unauthorized: If the token is missing, invalid or expired
+        Forbidden: If required_role is given and the token has another role
+    """
+    token = get_token_from_header()
+
+    if not token:
+        raise Unauthorized("Token de autenticacao nao fornecido")
+
+    cached = g.get('_auth_verified')
+    if cached is not None and cached[0] == token and cached[1] == token_type:
+        payload = cached[2]
+    else:
+        payload = verify_token(token, token_type=token_type)
+
+        if not payload:
+            raise Unauthorized("Token invalido ou expirado")
+
+        g._auth_verified = (token, token_type, payload)
+
+    if required_role is not None and payload.get('role') != required_role:
+        raise Forbidden("Acesso restrito a administradores")
+
+    return payload
+
+
+def _g_attrs(g_prefix: str) -> Tuple[str, str, str]:
+    return (f'{g_prefix}_id', f'{g_prefix}_email', f'{g_prefix}_name')
+
+
+def _store_identity(payload: dict, attrs: Tuple[str, str, str]) -> None:
+    """Store the token's subject, email and name in Flask's g object."""
+    id_attr, email_attr, name_attr = attrs
+    setattr(g, id_attr, payload.get('sub'))
+    setattr(g, email_attr, payload.get('email'))
+    setattr(g, name_attr, payload.get('name'))
+
+
+def register_auth_filter(
+    app,
+    protected: Iterable[Tuple[str, Optional[str], str]],
+    public: Iterable[str] = ()
+) -> None:
+    """
+    Verify the access token once per request, before routing to the view.
+
+    Requests under a protected prefix are rejected right away when the
+    token is missing, invalid or has the wrong role; otherwise the identity
+    is stored in g and the require_* decorators of the view only check it.
+
+    Args:
+        app: Flask application
+        protected: (url_prefix, require_role, g_prefix) triples
+        public: url prefixes left to the views even inside a protected one
+    """
+    rules = tuple(
+        (prefix, prefix + '/', role, _g_attrs(g_prefix))
+        for prefix, role, g_prefix in protected
+    )
+    public = tuple(public)
+
+    @app.before_request
+    def verify_access_token():
+        # CORS preflight requests never carry the token
+        if request.method == 'OPTIONS':
+            return None
+
+        path = request.path
+        if public and path.startswith(public):
+            return None
+
+        for prefix, subtree, role, attrs in rules:
+            if path == prefix or path.startswith(subtree):
+                payload = extract_and_verify(token_type='access', required_role=role)
+                _store_identity(payload, attrs)
+                break
+
+        return None
+
+
+class _RequireAuth:
+    """
+    View wrapper that verifies the access token before calling the view.
+
+    When register_auth_filter already verified the request, the identity
+    is read from g and no token work is repeated.
+
+    A slotted callable instead of a closure: the role and the g attribute
+    names are resolved once, when the view is decorated. __dict__ is kept
+    for the attributes copied by update_wrapper and set by apiflask.
+    """
+
+    __slots__ = ('_f', '_role', '_attrs', '__dict__')
+
+    def __init__(self, f, role: Optional[str] = None, g_prefix: str = 'current_user'):
+        self._f = f
+        self._role = role
+        self._attrs = _g_attrs(g_prefix)
+        update_wrapper(self, f)
+
+    def __call__(self, *args, **kwargs):
+        if g.get(self._attrs[0]) is None:
+            # Route outside the filtered prefixes: verify here
+            payload = extract_and_verify(token_type='access', required_role=self._role)
+            _store_identity(payload, self._attrs)
+
+        return self._f(*args, **kwargs)
+
+
+def make_auth_decorator(
+    *,
+    require_role: Optional[str] = None,
+    g_prefix: str = 'current_user'
+) -> Callable:
+    """
+    Build a decorator that requires a valid access token.
+
+    The decorated view stores the token's subject, email and name in
+    g.<g_prefix>_id, g.<g_prefix>_email and g.<g_prefix>_name.
+
+    Args:
+        require_role: Role the token must carry, if any
+        g_prefix: Prefix of the attributes set on Flask's g object
+    """
+    def decorator(f):
+        return _RequireAuth(f, require_role, g_prefix)
+
+    return decorator
+
+
+def make_getter(attr: str, doc: Optional[str] = None) -> Callable[[], Optional[str]]:
+    """Build a function returning getattr(g, attr, None)."""
+    def getter() -> Optional[str]:
+        return getattr(g, attr, None)
+
+    getter.__name__ = f'get_{attr}'
+    getter.__qualname__ = getter.__name__
+    getter.__doc__ = doc
+    return getter
@@ -0,0 +1,83 @@
+"""
+Simple in-process cache with per-entry expiration.
+
+Meant for small, read-heavy reference data (e.g. math areas). Each worker
+process keeps its own copy, so writers must delete the affected keys and
+other workers see the change after the entry expires.
+
+Usage:
+    from utils.cache import cache
+
+    data = cache.get('math_areas:all')
+    if data is None:
+        data = load_math_areas()
+        cache.set('math_areas:all', data, timeout=300)
+
+    # After a write
+    cache.delete('math_areas:all')
+"""
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Key-value cache whose entries expire after a timeout in seconds."""
+
+    def __init__(self, default_timeout: float = 300, max_entries: int = 4096):
+        self.default_timeout = default_timeout
+        self.max_entries = max_entries
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, timeout: Optional[float] = None) -> None:
+        """Store a value for `timeout` seconds (default_timeout if omitted)."""
+        if timeout is None:
+            timeout = self.default_timeout
+        now = monotonic()
+        with self._lock:
+            data = self._data
+            # Re-inserting moves the key to the end, keeping the oldest first
+            if data.pop(key, None) is None and len(data) >= self.max_entries:
+                self._evict()
+            data[key] = (now + timeout, value)
+
+    def _evict(self) -> None:
+        """Drop the oldest entry; expired ones are dropped as they are read."""
+        # Dicts keep insertion order: the first key is the oldest
+        del self._data[next(iter(self._data))]
+
+    def delete(self, *keys: Hashable) -> None:
+        """Remove the given keys, ignoring missing ones."""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+
+# Application-wide cache instance
+cache = TTLCache()
+
+
+# Keys shared between the services that read and invalidate them
+MATH_AREAS_CACHE_KEY = 'math_areas:all'
+
+
+def subareas_cache_key(area_id: str) -> str:
+    """Cache key of the active subareas list of a math area."""
+    return f'subareas:{area_id}'
@@ -1,6 +1,69 @@
 import random
-from utils.proposition import Proposition, CompoundProposition, OperatorNode, AtomicNode, PropositionNode, TruthConstant, TRUE, FALSE
-from utils.function_decorator import LogicOperator
+from utils.proposition import Proposition, CompoundProposition, OperatorNode, AtomicNode, PropositionNode, TRUE, FALSE
+from utils.proposition import KIND_VARIABLE, KIND_TRUE, KIND_FALSE, truth_table_bits, parse_proposition, ParseError
+from utils.function_decorator import OP_NOT, OP_IMP, OP_OR, OP_AND
+
+
+# Maximum number of node pairs remembered by Equivalence._nodes_equal
+_EQ_CACHE_SIZE = 4096
+
+# Maximum number of subtrees whose applicable laws are remembered by
+# Equivalence._subtree_laws
+_MATCH_CACHE_SIZE = 16384
+
+# Tags of the operators in PropositionNode._shape, and the shape keys the
+# matchers compare against
+_TAG_NOT = OP_NOT + 1
+_TAG_IMP = OP_IMP + 1
+_TAG_OR = OP_OR + 1
+_TAG_AND = OP_AND + 1
+_SHAPE_NOT_NOT = _TAG_NOT << 6 | _TAG_NOT << 3
+_SHAPE_NOT_LEFT_OF_OR = _TAG_OR << 3 | _TAG_NOT
+
+# Maximum number of operator nodes remembered by Equivalence._mk_op
+_INTERN_SIZE = 16384
+
+# Maximum number of successful proofs remembered by Equivalence._remember_proof
+_PROOF_MEMO_SIZE = 4096
+
+# Largest number of distinct atoms for which the provers compare truth tables
+# before searching (see Equivalence._tables_differ): a table costs 2 ** n bits
+_TABLE_CHECK_MAX_VARIABLES = 16
+
+# Bits of the truth constant laws returned by Equivalence._constant_laws
+_IDENTITY = 1
+_DOMINATION = 2
+_NEGATION_CONSTANT = 4
+_COMPLEMENT = 8
+_IMPLICATION_CONSTANT = 16
+
+# Fallback order of Equivalence.prove_simplification_nn when the predicted
+# law does not apply: simplifications first, then the structure laws that
+# expose them
+_SIMPLIFICATION_PRIORITY = (
+    'complement',      # p ∧ ~p → F (MOST IMPORTANT)
+    'domination',      # p ∧ F → F
+    'identity',        # p ∧ T → p
+    'negation_constant',
+    'double_negation',
+    'idempotence',
+    'absorption',
+    'factoring',
+)
+_STRUCTURE_PRIORITY = (
+    'distributivity',   # Expose p ∧ ~p patterns
+    'associativity',    # Regroup terms
+    'de_morgan',
+    'implication_elimination',
+    'commutativity',
+)
+
+# Goal of Equivalence.prove_simplification_nn -> _kind of its constant
+_GOAL_KINDS = {'F': KIND_FALSE, 'T': KIND_TRUE}
+
+# Operator of each op_id; the dual of a conjunction or disjunction with tag
+# op_id is _OPERATORS[op_id ^ 1]
+_OPERATORS = (Proposition.__invert__, Proposition.__rshift__, Proposition.__add__, Proposition.__mul__)
 
 
 class Equivalence:
@@ -31,94 +94,119 @@ class Equivalence:
     - Implication: T → p = p, F → p = T, p → T = T, p → F = ~p
     """
 
+    def __init__(self):
+        # (id(node1), id(node2)) -> (node1, node2, equal). The nodes are kept
+        # in the entry so their ids cannot be reused while it is cached.
+        self._eq_cache = {}
+        # id(node) -> (node, _MATCHER_BITS of the laws applicable in the subtree)
+        self._match_cache = {}
+        # (op_id, id(left), id(right)) -> OperatorNode, see _mk_op
+        self._op_intern = {}
+        # (predictor or None, hash1, hash2, record_strings) -> ((prop1, prop2),
+        # proof), only for successful proofs, see _cached_proof
+        self._proof_memo = {}
+        # Transformation tables, see _law_tiers and _transformations_by_name
+        self._tiers = None
+        self._by_name = None
+        # Targets of the bidirectional and absurdity provers
+        self._true_prop = self._constant_compound(TRUE)
+        self._false_prop = self._constant_compound(FALSE)
+
+    # Every law is split in three methods:
+    # - _match_*: inspects the root once and returns the pieces the rewrite
+    #   needs (subtrees or the resulting constant), or None
+    # - check_*: the match succeeded
+    # - apply_*: builds the result from the match, without inspecting again
+
     # ==================== Double Negation ====================
     # ~~p = p
 
+    def _match_double_negation(self, root: PropositionNode):
+        """Return p for ~~p, None otherwise."""
+        if root._shape != _SHAPE_NOT_NOT:
+            return None
+        return root.left.left
+
     def check_double_negation(self, proposition: CompoundProposition) -> bool:
         """Check if double negation can be eliminated: ~~p -> p"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.operator.name != '__invert__' or root.right is not None:
-            return False
-        inner = root.left
-        if not isinstance(inner, OperatorNode):
-            return False
-        return inner.operator.name == '__invert__' and inner.right is None
+        return self._match_double_negation(proposition.root) is not None
 
     def apply_double_negation(self, proposition: CompoundProposition) -> CompoundProposition:
         """Apply double negation elimination: ~~p -> p"""
-        if not self.check_double_negation(proposition):
+        inner_operand = self._match_double_negation(proposition.root)
+        if inner_operand is None:
             return proposition
-        inner_operand = proposition.root.left.left
         return self._node_to_compound(inner_operand)
 
     # ==================== De Morgan's Laws ====================
     # Forward:  ~(p ^ q) = ~p v ~q,  ~(p v q) = ~p ^ ~q
     # Reverse:  p v q = ~(~p ^ ~q),  p ^ q = ~(~p v ~q)
 
+    def _match_de_morgan(self, root: PropositionNode):
+        """Return the negated conjunction/disjunction of ~(p ^ q) or ~(p v q)."""
+        shape = root._shape
+        # A negation whose operand is tagged OR or AND
+        if shape >> 6 != _TAG_NOT or (shape >> 3) & 7 <= _TAG_IMP:
+            return None
+        return root.left
+
     def check_de_morgan(self, proposition: CompoundProposition) -> bool:
         """Check if De Morgan's law (forward) can be applied: ~(p ^ q) or ~(p v q)"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.operator.name != '__invert__' or root.right is not None:
-            return False
-        inner = root.left
-        if not isinstance(inner, OperatorNode):
-            return False
-        return inner.operator.name in ('__add__', '__mul__') and inner.right is not None
+        return self._match_de_morgan(proposition.root) is not None
 
     def apply_de_morgan(self, proposition: CompoundProposition) -> CompoundProposition:
         """
         Apply De Morgan's law (forward):
         ~(p ^ q) -> ~p v ~q
         ~(p v q) -> ~p ^ ~q
+
+        An operand that is already a negation ~x becomes x, not ~~x.
         """
-        if not self.check_de_morgan(proposition):
+        inner = self._match_de_morgan(proposition.root)
+        if inner is None:
             return proposition
 
-        inner = proposition.root.left
         left_operand = inner.left
         right_operand = inner.right
 
-        not_left = CompoundProposition(Proposition.__invert__, self._node_to_compound(left_operand))
-        not_right = CompoundProposition(Proposition.__invert__, self._node_to_compound(right_operand))
+        not_left = self._negated(left_operand)
+        not_right = self._negated(right_operand)
 
-        if inner.operator.name == '__mul__':
-            return CompoundProposition(Proposition.__add__, not_left, not_right)
-        else:
-            return CompoundProposition(Proposition.__mul__, not_left, not_right)
+        return self._node_to_compound(self._mk_op(_OPERATORS[inner.operator.op_id ^ 1], not_left, not_right))
+
+    def _match_binary_and_or(self, root: PropositionNode):
+        """Return root when it is a conjunction or a disjunction, None otherwise."""
+        if root.arity != 2:
+            return None
+        if root.operator.op_id < OP_OR:
+            return None
+        return root
 
     def check_de_morgan_reverse(self, proposition: CompoundProposition) -> bool:
         """Check if De Morgan's law (reverse) can be applied: p v q or p ^ q"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        return root.operator.name in ('__add__', '__mul__') and root.right is not None
+        return self._match_binary_and_or(proposition.root) is not None
 
     def apply_de_morgan_reverse(self, proposition: CompoundProposition) -> CompoundProposition:
         """
         Apply De Morgan's law (reverse):
         p v q -> ~(~p ^ ~q)
         p ^ q -> ~(~p v ~q)
+
+        An operand that is already a negation ~x becomes x, not ~~x.
         """
-        if not self.check_de_morgan_reverse(proposition):
+        root = self._match_binary_and_or(proposition.root)
+        if root is None:
             return proposition
 
-        root = proposition.root
         left_operand = root.left
         right_operand = root.right
 
-        not_left = CompoundProposition(Proposition.__invert__, self._node_to_compound(left_operand))
-        not_right = CompoundProposition(Proposition.__invert__, self._node_to_compound(right_operand))
+        not_left = self._negated(left_operand)
+        not_right = self._negated(right_operand)
 
-        if root.operator.name == '__add__':
-            inner = CompoundProposition(Proposition.__mul__, not_left, not_right)
-        else:
-            inner = CompoundProposition(Proposition.__add__, not_left, not_right)
+        inner = self._mk_op(_OPERATORS[root.operator.op_id ^ 1], not_left, not_right)
 
-        return CompoundProposition(Proposition.__invert__, inner)
+        return self._node_to_compound(self._mk_op(Proposition.__invert__, inner))
 
     # ==================== Commutativity ====================
     # p ^ q = q ^ p
@@ -127,183 +215,156 @@ class Equivalence:
 
     def check_commutativity(self, proposition: CompoundProposition) -> bool:
         """Check if commutativity can be applied (only AND and OR, not implication)"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
         # Only AND and OR are commutative, NOT implication
-        return root.operator.name in ('__add__', '__mul__')
+        return self._match_binary_and_or(proposition.root) is not None
 
     def apply_commutativity(self, proposition: CompoundProposition) -> CompoundProposition:
         """Apply commutativity: p op q -> q op p"""
-        if not self.check_commutativity(proposition):
+        root = self._match_binary_and_or(proposition.root)
+        if root is None:
             return proposition
 
-        root = proposition.root
-        left = self._node_to_compound(root.right)
-        right = self._node_to_compound(root.left)
-        return CompoundProposition(root.operator, left, right)
+        # Only the two child references are swapped, the subtrees are reused
+        return self._node_to_compound(self._mk_op(root.operator, root.right, root.left))
 
     # ==================== Associativity ====================
     # (p ^ q) ^ r = p ^ (q ^ r)
     # (p v q) v r = p v (q v r)
     # NOTE: Implication is NOT associative
 
+    def _match_associativity(self, root: PropositionNode):
+        """Return (p op q) for (p op q) op r, None otherwise."""
+        shape = root._shape
+        # Only AND and OR are associative, and the left child must be the
+        # same operator
+        tag = shape >> 6
+        if tag <= _TAG_IMP or (shape >> 3) & 7 != tag:
+            return None
+        return root.left
+
     def check_associativity(self, proposition: CompoundProposition) -> bool:
         """Check if associativity can be applied: (p op q) op r -> p op (q op r)"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
-        # Only AND and OR are associative
-        if root.operator.name not in ('__add__', '__mul__'):
-            return False
-        # Left child must be same operator
-        left = root.left
-        if not isinstance(left, OperatorNode):
-            return False
-        if left.right is None:
-            return False
-        return left.operator.name == root.operator.name
+        return self._match_associativity(proposition.root) is not None
 
     def apply_associativity(self, proposition: CompoundProposition) -> CompoundProposition:
         """Apply associativity: (p op q) op r -> p op (q op r)"""
-        if not self.check_associativity(proposition):
+        left_inner = self._match_associativity(proposition.root)  # (p op q)
+        if left_inner is None:
             return proposition
 
         root = proposition.root
         op = root.operator
         # (p op q) op r
-        left_inner = root.left  # (p op q)
         p = left_inner.left
         q = left_inner.right
         r = root.right
 
-        # p op (q op r)
-        p_comp = self._node_to_compound(p)
-        q_comp = self._node_to_compound(q)
-        r_comp = self._node_to_compound(r)
-
-        q_op_r = CompoundProposition(op, q_comp, r_comp)
-        return CompoundProposition(op, p_comp, q_op_r)
+        # p op (q op r), reusing the three subtrees as they are
+        q_op_r = self._mk_op(op, q, r)
+        return self._node_to_compound(self._mk_op(op, p, q_op_r))
 
     # ==================== Idempotence ====================
     # p ^ p = p
     # p v p = p
     # NOTE: p → p is a tautology (always true), NOT equal to p
 
+    def _match_idempotence(self, root: PropositionNode):
+        """Return p for p op p, None otherwise."""
+        # Only AND and OR have idempotence, NOT implication
+        if self._match_binary_and_or(root) is None:
+            return None
+        if not self._nodes_equal(root.left, root.right):
+            return None
+        return root.left
+
     def check_idempotence(self, proposition: CompoundProposition) -> bool:
         """Check if idempotence can be applied: p op p -> p (only AND and OR)"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
-        # Only AND and OR have idempotence, NOT implication
-        if root.operator.name not in ('__add__', '__mul__'):
-            return False
-        return self._nodes_equal(root.left, root.right)
+        return self._match_idempotence(proposition.root) is not None
 
     def apply_idempotence(self, proposition: CompoundProposition) -> CompoundProposition:
         """Apply idempotence: p op p -> p"""
-        if not self.check_idempotence(proposition):
+        operand = self._match_idempotence(proposition.root)
+        if operand is None:
             return proposition
-        return self._node_to_compound(proposition.root.left)
+        return self._node_to_compound(operand)
 
     # ==================== Absorption ====================
     # p ^ (p v q) = p
     # p v (p ^ q) = p
 
-    def check_absorption(self, proposition: CompoundProposition) -> bool:
-        """Check if absorption can be applied: p op (p op' q) -> p"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
+    def _match_absorption(self, root: PropositionNode):
+        """Return the absorbing operand p of p op (p op' q), None otherwise."""
+        if self._match_binary_and_or(root) is None:
+            return None
 
-        outer_op = root.operator.name
-        if outer_op not in ('__add__', '__mul__'):
-            return False
+        inner_op = root.operator.op_id ^ 1
+        left = root.left
+        right = root.right
 
-        inner_op = '__mul__' if outer_op == '__add__' else '__add__'
+        # Each probe compares the structural hashes first: most probes fail,
+        # and then they fail without calling _nodes_equal
+        if right.arity == 2 and right.operator.op_id == inner_op:
+            h = left._hash
+            if h == right.left._hash and self._nodes_equal(left, right.left):
+                return left
+            if h == right.right._hash and self._nodes_equal(left, right.right):
+                return left
 
-        if isinstance(root.right, OperatorNode) and root.right.right is not None:
-            if root.right.operator.name == inner_op:
-                if self._nodes_equal(root.left, root.right.left):
-                    return True
-                if self._nodes_equal(root.left, root.right.right):
-                    return True
+        if left.arity == 2 and left.operator.op_id == inner_op:
+            h = right._hash
+            if h == left.left._hash and self._nodes_equal(right, left.left):
+                return right
+            if h == left.right._hash and self._nodes_equal(right, left.right):
+                return right
 
-        if isinstance(root.left, OperatorNode) and root.left.right is not None:
-            if root.left.operator.name == inner_op:
-                if self._nodes_equal(root.right, root.left.left):
-                    return True
-                if self._nodes_equal(root.right, root.left.right):
-                    return True
+        return None
 
-        return False
+    def check_absorption(self, proposition: CompoundProposition) -> bool:
+        """Check if absorption can be applied: p op (p op' q) -> p"""
+        return self._match_absorption(proposition.root) is not None
 
     def apply_absorption(self, proposition: CompoundProposition) -> CompoundProposition:
         """Apply absorption: p op (p op' q) -> p"""
-        if not self.check_absorption(proposition):
+        keeper = self._match_absorption(proposition.root)
+        if keeper is None:
             return proposition
-
-        root = proposition.root
-        outer_op = root.operator.name
-        inner_op = '__mul__' if outer_op == '__add__' else '__add__'
-
-        if isinstance(root.right, OperatorNode) and root.right.right is not None:
-            if root.right.operator.name == inner_op:
-                if self._nodes_equal(root.left, root.right.left):
-                    return self._node_to_compound(root.left)
-                if self._nodes_equal(root.left, root.right.right):
-                    return self._node_to_compound(root.left)
-
-        if isinstance(root.left, OperatorNode) and root.left.right is not None:
-            if root.left.operator.name == inner_op:
-                if self._nodes_equal(root.right, root.left.left):
-                    return self._node_to_compound(root.right)
-                if self._nodes_equal(root.right, root.left.right):
-                    return self._node_to_compound(root.right)
-
-        return proposition
+        return self._node_to_compound(keeper)
 
     # ==================== Distributivity ====================
     # p ^ (q v r) = (p ^ q) v (p ^ r)
     # p v (q ^ r) = (p v q) ^ (p v r)
     # NOTE: Distributivity only applies to AND/OR, not implication
 
+    def _match_distributivity(self, root: PropositionNode):
+        """
+        Return (p, inner) for p op inner where inner can be distributed over,
+        preferring the right child as inner. None otherwise.
+        """
+        # Only AND and OR can be distributed
+        if self._match_binary_and_or(root) is None:
+            return None
+
+        outer_op = root.operator.op_id
+        if self._can_distribute_child(root.right, outer_op):
+            return root.left, root.right
+        if self._can_distribute_child(root.left, outer_op):
+            return root.right, root.left
+        return None
+
     def check_distributivity(self, proposition: CompoundProposition) -> bool:
         """
         Check if distributive property can be applied.
         Example: p v (p ^ q) can be distributed because outer (v) != inner (^)
         Only applies to AND and OR operators.
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode) or root.right is None:
-            return False
+        return self._match_distributivity(proposition.root) is not None
 
-        outer_op = root.operator.name
-        # Only AND and OR can be distributed
-        if outer_op not in ('__add__', '__mul__'):
-            return False
-
-        return (self._can_distribute_child(root.left, outer_op) or
-                self._can_distribute_child(root.right, outer_op))
-
-    def _can_distribute_child(self, node, outer_op: str) -> bool:
+    def _can_distribute_child(self, node, outer_op: int) -> bool:
         """Check if a child node can be distributed over (only AND/OR)."""
-        if not isinstance(node, OperatorNode):
-            return False
-        if node.right is None:
-            return False
-        # Only AND and OR can be distributed over
-        if node.operator.name not in ('__add__', '__mul__'):
+        if node.arity != 2:
             return False
-        return node.operator.name != outer_op
+        # Only the dual of the outer AND/OR can be distributed over
+        return node.operator.op_id == outer_op ^ 1
 
     def apply_distributivity(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -311,68 +372,49 @@ class Equivalence:
         p ^ (q v r) -> (p ^ q) v (p ^ r)
         p v (q ^ r) -> (p v q) ^ (p v r)
         """
-        if not self.check_distributivity(proposition):
+        match = self._match_distributivity(proposition.root)
+        if match is None:
             return proposition
 
-        root = proposition.root
-        outer_op = root.operator
-
-        if self._can_distribute_child(root.right, outer_op.name):
-            p = root.left
-            inner = root.right
-            q = inner.left
-            r = inner.right
-            inner_op = inner.operator
-        else:
-            p = root.right
-            inner = root.left
-            q = inner.left
-            r = inner.right
-            inner_op = inner.operator
-
-        p_compound = self._node_to_compound(p)
-        q_compound = self._node_to_compound(q)
-        r_compound = self._node_to_compound(r)
+        outer_op = proposition.root.operator
+        p, inner = match
+        q = inner.left
+        r = inner.right
+        inner_op = inner.operator
 
-        left_result = CompoundProposition(outer_op, p_compound, q_compound)
-        right_result = CompoundProposition(outer_op, p_compound, r_compound)
+        left_result = self._mk_op(outer_op, p, q)
+        right_result = self._mk_op(outer_op, p, r)
 
-        return CompoundProposition(inner_op, left_result, right_result)
+        return self._node_to_compound(self._mk_op(inner_op, left_result, right_result))
 
     # ==================== Factoring (Reverse Distributivity) ====================
     # (p ^ q) v (p ^ r) = p ^ (q v r)
     # (p v q) ^ (p v r) = p v (q ^ r)
     # This is the SIMPLIFYING direction (reduces complexity)
 
-    def check_factoring(self, proposition: CompoundProposition) -> bool:
+    def _match_factoring(self, root: PropositionNode):
         """
-        Check if factoring (reverse distributivity) can be applied.
-        Pattern: (p op q) op' (p op r) -> p op (q op' r)
-        Where op and op' are different (one AND, one OR).
-
-        Example: (p ^ q) v (p ^ r) -> p ^ (q v r)
+        Return (common, remainder1, remainder2) for (p op q) op' (p op r),
+        None otherwise.
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode) or root.right is None:
-            return False
+        if self._match_binary_and_or(root) is None:
+            return None
 
-        outer_op = root.operator.name
-        if outer_op not in ('__add__', '__mul__'):
-            return False
+        outer_op = root.operator.op_id
 
         # Both children must be binary operations with the opposite operator
         left = root.left
         right = root.right
 
-        if not isinstance(left, OperatorNode) or left.right is None:
-            return False
-        if not isinstance(right, OperatorNode) or right.right is None:
-            return False
+        if left.arity != 2:
+            return None
+        if right.arity != 2:
+            return None
 
         # Inner operations must be the same and different from outer
-        inner_op = '__mul__' if outer_op == '__add__' else '__add__'
-        if left.operator.name != inner_op or right.operator.name != inner_op:
-            return False
+        inner_op = outer_op ^ 1
+        if left.operator.op_id != inner_op or right.operator.op_id != inner_op:
+            return None
 
         # Check if there's a common factor
         # (p ^ q) v (p ^ r) - common factor p on left of both
@@ -385,17 +427,32 @@ class Equivalence:
         right_left = right.left
         right_right = right.right
 
-        # Check all four combinations for common factor
-        if self._nodes_equal(left_left, right_left):
-            return True  # p in both left positions
-        if self._nodes_equal(left_left, right_right):
-            return True  # p in left.left and right.right
-        if self._nodes_equal(left_right, right_left):
-            return True  # p in left.right and right.left
-        if self._nodes_equal(left_right, right_right):
-            return True  # p in both right positions
+        # Check all four combinations for common factor, comparing the
+        # structural hashes first as in _match_absorption
+        ll_hash = left_left._hash
+        lr_hash = left_right._hash
+        rl_hash = right_left._hash
+        rr_hash = right_right._hash
+        if ll_hash == rl_hash and self._nodes_equal(left_left, right_left):
+            return left_left, left_right, right_right  # p in both left positions
+        if ll_hash == rr_hash and self._nodes_equal(left_left, right_right):
+            return left_left, left_right, right_left  # p in left.left and right.right
+        if lr_hash == rl_hash and self._nodes_equal(left_right, right_left):
+            return left_right, left_left, right_right  # p in left.right and right.left
+        if lr_hash == rr_hash and self._nodes_equal(left_right, right_right):
+            return left_right, left_left, right_left  # p in both right positions
+
+        return None
 
-        return False
+    def check_factoring(self, proposition: CompoundProposition) -> bool:
+        """
+        Check if factoring (reverse distributivity) can be applied.
+        Pattern: (p op q) op' (p op r) -> p op (q op' r)
+        Where op and op' are different (one AND, one OR).
+
+        Example: (p ^ q) v (p ^ r) -> p ^ (q v r)
+        """
+        return self._match_factoring(proposition.root) is not None
 
     def apply_factoring(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -403,66 +460,33 @@ class Equivalence:
         (p ^ q) v (p ^ r) -> p ^ (q v r)
         (p v q) ^ (p v r) -> p v (q ^ r)
         """
-        if not self.check_factoring(proposition):
+        match = self._match_factoring(proposition.root)
+        if match is None:
             return proposition
 
-        root = proposition.root
-        outer_op = root.operator  # v in (p^q) v (p^r)
-        inner_op_name = '__mul__' if outer_op.name == '__add__' else '__add__'
-        inner_op = Proposition.__mul__ if inner_op_name == '__mul__' else Proposition.__add__
-
-        left = root.left   # (p ^ q)
-        right = root.right  # (p ^ r)
-
-        left_left = left.left
-        left_right = left.right
-        right_left = right.left
-        right_right = right.right
-
-        # Find the common factor and the remainders
-        common = None
-        remainder1 = None
-        remainder2 = None
-
-        if self._nodes_equal(left_left, right_left):
-            common = left_left
-            remainder1 = left_right
-            remainder2 = right_right
-        elif self._nodes_equal(left_left, right_right):
-            common = left_left
-            remainder1 = left_right
-            remainder2 = right_left
-        elif self._nodes_equal(left_right, right_left):
-            common = left_right
-            remainder1 = left_left
-            remainder2 = right_right
-        elif self._nodes_equal(left_right, right_right):
-            common = left_right
-            remainder1 = left_left
-            remainder2 = right_left
-
-        if common is None:
-            return proposition
+        outer_op = proposition.root.operator  # v in (p^q) v (p^r)
+        inner_op = _OPERATORS[outer_op.op_id ^ 1]
 
-        common_comp = self._node_to_compound(common)
-        rem1_comp = self._node_to_compound(remainder1)
-        rem2_comp = self._node_to_compound(remainder2)
+        common, remainder1, remainder2 = match
 
         # Build: common inner_op (remainder1 outer_op remainder2)
         # e.g., p ^ (q v r)
-        inner_result = CompoundProposition(outer_op, rem1_comp, rem2_comp)
-        return CompoundProposition(inner_op, common_comp, inner_result)
+        inner_result = self._mk_op(outer_op, remainder1, remainder2)
+        return self._node_to_compound(self._mk_op(inner_op, common, inner_result))
 
     # ==================== Implication Laws ====================
     # Implication Elimination: p → q = ~p v q
     # Contraposition: p → q = ~q → ~p
 
+    def _match_implication(self, root: PropositionNode):
+        """Return root when it is an implication, None otherwise."""
+        if root.arity != 2 or root.operator.op_id != OP_IMP:
+            return None
+        return root
+
     def check_implication_elimination(self, proposition: CompoundProposition) -> bool:
         """Check if implication elimination can be applied: p → q -> ~p v q"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        return root.operator.name == '__rshift__' and root.right is not None
+        return self._match_implication(proposition.root) is not None
 
     def apply_implication_elimination(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -470,17 +494,24 @@ class Equivalence:
 
         This converts an implication to its equivalent disjunction form.
         """
-        if not self.check_implication_elimination(proposition):
+        root = self._match_implication(proposition.root)
+        if root is None:
             return proposition
 
-        root = proposition.root
         left_operand = root.left
         right_operand = root.right
 
         # ~p
-        not_left = CompoundProposition(Proposition.__invert__, self._node_to_compound(left_operand))
+        not_left = self._mk_op(Proposition.__invert__, left_operand)
         # ~p v q
-        return CompoundProposition(Proposition.__add__, not_left, self._node_to_compound(right_operand))
+        return self._node_to_compound(self._mk_op(Proposition.__add__, not_left, right_operand))
+
+    def _match_implication_introduction(self, root: PropositionNode):
+        """Return p for ~p v q, None otherwise."""
+        # A disjunction whose left operand is a negation
+        if root._shape >> 3 != _SHAPE_NOT_LEFT_OF_OR:
+            return None
+        return root.left.left
 
     def check_implication_introduction(self, proposition: CompoundProposition) -> bool:
         """
@@ -488,16 +519,7 @@ class Equivalence:
 
         Pattern: The left operand must be a negation.
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.operator.name != '__add__' or root.right is None:
-            return False
-        # Check if left is a negation
-        left = root.left
-        if not isinstance(left, OperatorNode):
-            return False
-        return left.operator.name == '__invert__' and left.right is None
+        return self._match_implication_introduction(proposition.root) is not None
 
     def apply_implication_introduction(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -505,42 +527,39 @@ class Equivalence:
 
         This converts a disjunction with a negated left operand to an implication.
         """
-        if not self.check_implication_introduction(proposition):
+        # Get p from ~p (the inner operand of the negation)
+        p = self._match_implication_introduction(proposition.root)
+        if p is None:
             return proposition
 
-        root = proposition.root
-        # Get p from ~p (the inner operand of the negation)
-        p = root.left.left
-        q = root.right
+        q = proposition.root.right
 
-        return CompoundProposition(Proposition.__rshift__, self._node_to_compound(p), self._node_to_compound(q))
+        return self._node_to_compound(self._mk_op(Proposition.__rshift__, p, q))
 
     def check_contraposition(self, proposition: CompoundProposition) -> bool:
         """Check if contraposition can be applied: p → q -> ~q → ~p"""
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        return root.operator.name == '__rshift__' and root.right is not None
+        return self._match_implication(proposition.root) is not None
 
     def apply_contraposition(self, proposition: CompoundProposition) -> CompoundProposition:
         """
         Apply contraposition: p → q -> ~q → ~p
 
         This transforms an implication to its contrapositive form.
+        An operand that is already a negation ~x becomes x, not ~~x.
         """
-        if not self.check_contraposition(proposition):
+        root = self._match_implication(proposition.root)
+        if root is None:
             return proposition
 
-        root = proposition.root
         p = root.left
         q = root.right
 
         # ~q
-        not_q = CompoundProposition(Proposition.__invert__, self._node_to_compound(q))
+        not_q = self._negated(q)
         # ~p
-        not_p = CompoundProposition(Proposition.__invert__, self._node_to_compound(p))
+        not_p = self._negated(p)
         # ~q → ~p
-        return CompoundProposition(Proposition.__rshift__, not_q, not_p)
+        return self._node_to_compound(self._mk_op(Proposition.__rshift__, not_q, not_p))
 
     # ==================== Truth Constant Laws ====================
     # Identity: p v F = p, p ^ T = p
@@ -550,50 +569,97 @@ class Equivalence:
 
     def _is_true_constant(self, node) -> bool:
         """Check if node represents the True constant."""
-        if isinstance(node, AtomicNode):
-            prop = node.proposition
-            return hasattr(prop, 'is_constant') and prop.is_constant() and prop.is_true()
+        if isinstance(node, PropositionNode):
+            return node._kind == KIND_TRUE
         if hasattr(node, 'is_constant') and node.is_constant():
             return node.is_true()
         return False
 
     def _is_false_constant(self, node) -> bool:
         """Check if node represents the False constant."""
-        if isinstance(node, AtomicNode):
-            prop = node.proposition
-            return hasattr(prop, 'is_constant') and prop.is_constant() and prop.is_false()
+        if isinstance(node, PropositionNode):
+            return node._kind == KIND_FALSE
         if hasattr(node, 'is_constant') and node.is_constant():
             return node.is_false()
         return False
 
     def _is_constant(self, node) -> bool:
         """Check if node is a truth constant (T or F)."""
-        if isinstance(node, AtomicNode):
-            prop = node.proposition
-            return hasattr(prop, 'is_constant') and prop.is_constant()
+        if isinstance(node, PropositionNode):
+            return node._kind != KIND_VARIABLE
         return hasattr(node, 'is_constant') and node.is_constant()
 
+    def _constant_laws(self, root: PropositionNode) -> int:
+        """
+        Return the bits of every truth constant law applicable at root.
+
+        Identity, domination, negation of a constant, complement and
+        implication with a constant are tested together, with a single
+        dispatch on the root operator instead of one check per law.
+        """
+        if not root.is_op:
+            return 0
+
+        op = root.operator.op_id
+        left = root.left
+        right = root.right
+
+        if op == OP_NOT:
+            if right is None and left._kind != KIND_VARIABLE:
+                return _NEGATION_CONSTANT
+            return 0
+
+        if right is None:
+            return 0
+
+        if op == OP_IMP:
+            if left._kind != KIND_VARIABLE or right._kind != KIND_VARIABLE:
+                return _IMPLICATION_CONSTANT
+            return 0
+
+        # p v F = p, p v T = T / p ^ T = p, p ^ F = F
+        if op == OP_OR:
+            neutral, absorbing = KIND_FALSE, KIND_TRUE
+        else:
+            neutral, absorbing = KIND_TRUE, KIND_FALSE
+
+        laws = 0
+        if left._kind == neutral or right._kind == neutral:
+            laws |= _IDENTITY
+        if left._kind == absorbing or right._kind == absorbing:
+            laws |= _DOMINATION
+        if self._match_complement(root) is not None:
+            laws |= _COMPLEMENT
+        return laws
+
+    def _match_identity(self, root: PropositionNode):
+        """Return p for p v F or p ^ T (either order), None otherwise."""
+        if root.arity != 2:
+            return None
+
+        if root.operator.op_id == OP_OR:
+            # p v F -> p
+            if root.right._kind == KIND_FALSE:
+                return root.left
+            if root.left._kind == KIND_FALSE:
+                return root.right
+
+        elif root.operator.op_id == OP_AND:
+            # p ^ T -> p
+            if root.right._kind == KIND_TRUE:
+                return root.left
+            if root.left._kind == KIND_TRUE:
+                return root.right
+
+        return None
+
     def check_identity(self, proposition: CompoundProposition) -> bool:
         """
         Check if identity law can be applied:
         - p v F = p
         - p ^ T = p
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
-
-        # p v F
-        if root.operator.name == '__add__':
-            return self._is_false_constant(root.left) or self._is_false_constant(root.right)
-
-        # p ^ T
-        if root.operator.name == '__mul__':
-            return self._is_true_constant(root.left) or self._is_true_constant(root.right)
-
-        return False
+        return self._match_identity(proposition.root) is not None
 
     def apply_identity(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -601,26 +667,27 @@ class Equivalence:
         - p v F -> p
         - p ^ T -> p
         """
-        if not self.check_identity(proposition):
+        operand = self._match_identity(proposition.root)
+        if operand is None:
             return proposition
+        return self._node_to_compound(operand)
 
-        root = proposition.root
+    def _match_domination(self, root: PropositionNode):
+        """Return T for p v T, F for p ^ F (either order), None otherwise."""
+        if root.arity != 2:
+            return None
 
-        if root.operator.name == '__add__':
-            # p v F -> p
-            if self._is_false_constant(root.right):
-                return self._node_to_compound(root.left)
-            if self._is_false_constant(root.left):
-                return self._node_to_compound(root.right)
+        # p v T -> T
+        if root.operator.op_id == OP_OR:
+            if root.left._kind == KIND_TRUE or root.right._kind == KIND_TRUE:
+                return TRUE
 
-        if root.operator.name == '__mul__':
-            # p ^ T -> p
-            if self._is_true_constant(root.right):
-                return self._node_to_compound(root.left)
-            if self._is_true_constant(root.left):
-                return self._node_to_compound(root.right)
+        # p ^ F -> F
+        elif root.operator.op_id == OP_AND:
+            if root.left._kind == KIND_FALSE or root.right._kind == KIND_FALSE:
+                return FALSE
 
-        return proposition
+        return None
 
     def check_domination(self, proposition: CompoundProposition) -> bool:
         """
@@ -628,21 +695,7 @@ class Equivalence:
         - p v T = T
         - p ^ F = F
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
-
-        # p v T
-        if root.operator.name == '__add__':
-            return self._is_true_constant(root.left) or self._is_true_constant(root.right)
-
-        # p ^ F
-        if root.operator.name == '__mul__':
-            return self._is_false_constant(root.left) or self._is_false_constant(root.right)
-
-        return False
+        return self._match_domination(proposition.root) is not None
 
     def apply_domination(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -650,20 +703,22 @@ class Equivalence:
         - p v T -> T
         - p ^ F -> F
         """
-        if not self.check_domination(proposition):
+        constant = self._match_domination(proposition.root)
+        if constant is None:
             return proposition
+        return constant
 
-        root = proposition.root
-
-        if root.operator.name == '__add__':
-            # p v T -> T
-            return TRUE
+    def _match_negation_constant(self, root: PropositionNode):
+        """Return F for ~T, T for ~F, None otherwise."""
+        if root.arity != 1 or root.operator.op_id != OP_NOT:
+            return None
 
-        if root.operator.name == '__mul__':
-            # p ^ F -> F
+        inner = root.left
+        if inner._kind == KIND_TRUE:
             return FALSE
-
-        return proposition
+        if inner._kind == KIND_FALSE:
+            return TRUE
+        return None
 
     def check_negation_constant(self, proposition: CompoundProposition) -> bool:
         """
@@ -671,13 +726,7 @@ class Equivalence:
         - ~T = F
         - ~F = T
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.operator.name != '__invert__' or root.right is not None:
-            return False
-
-        return self._is_constant(root.left)
+        return self._match_negation_constant(proposition.root) is not None
 
     def apply_negation_constant(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -685,17 +734,30 @@ class Equivalence:
         - ~T -> F
         - ~F -> T
         """
-        if not self.check_negation_constant(proposition):
+        constant = self._match_negation_constant(proposition.root)
+        if constant is None:
             return proposition
+        return constant
 
-        inner = proposition.root.left
+    def _match_complement(self, root: PropositionNode):
+        """Return T for p v ~p, F for p ^ ~p (either order), None otherwise."""
+        if self._match_binary_and_or(root) is None:
+            return None
 
-        if self._is_true_constant(inner):
-            return FALSE
-        if self._is_false_constant(inner):
-            return TRUE
+        constant = TRUE if root.operator.op_id == OP_OR else FALSE
+
+        # Check if one side is the negation of the other
+        # Case: p op ~p
+        if root.right.arity == 1 and root.right.operator.op_id == OP_NOT:
+            if self._nodes_equal(root.left, root.right.left):
+                return constant
+
+        # Case: ~p op p
+        if root.left.arity == 1 and root.left.operator.op_id == OP_NOT:
+            if self._nodes_equal(root.left.left, root.right):
+                return constant
 
-        return proposition
+        return None
 
     def check_complement(self, proposition: CompoundProposition) -> bool:
         """
@@ -703,28 +765,7 @@ class Equivalence:
         - p v ~p = T
         - p ^ ~p = F
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.right is None:
-            return False
-        if root.operator.name not in ('__add__', '__mul__'):
-            return False
-
-        # Check if one side is the negation of the other
-        # Case: p op ~p
-        if isinstance(root.right, OperatorNode):
-            if root.right.operator.name == '__invert__' and root.right.right is None:
-                if self._nodes_equal(root.left, root.right.left):
-                    return True
-
-        # Case: ~p op p
-        if isinstance(root.left, OperatorNode):
-            if root.left.operator.name == '__invert__' and root.left.right is None:
-                if self._nodes_equal(root.left.left, root.right):
-                    return True
-
-        return False
+        return self._match_complement(proposition.root) is not None
 
     def apply_complement(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -732,20 +773,39 @@ class Equivalence:
         - p v ~p -> T
         - p ^ ~p -> F
         """
-        if not self.check_complement(proposition):
+        constant = self._match_complement(proposition.root)
+        if constant is None:
             return proposition
+        return constant
 
-        root = proposition.root
+    def _match_implication_constant(self, root: PropositionNode):
+        """
+        Return (operand, negate) describing the simplified implication,
+        where operand is a node or the T constant. None otherwise.
+        """
+        if self._match_implication(root) is None:
+            return None
 
-        if root.operator.name == '__add__':
-            # p v ~p -> T
-            return TRUE
+        left = root.left
+        right = root.right
 
-        if root.operator.name == '__mul__':
-            # p ^ ~p -> F
-            return FALSE
+        # T → p -> p
+        if left._kind == KIND_TRUE:
+            return right, False
+
+        # F → p -> T
+        if left._kind == KIND_FALSE:
+            return TRUE, False
 
-        return proposition
+        # p → T -> T
+        if right._kind == KIND_TRUE:
+            return TRUE, False
+
+        # p → F -> ~p
+        if right._kind == KIND_FALSE:
+            return left, True
+
+        return None
 
     def check_implication_constant(self, proposition: CompoundProposition) -> bool:
         """
@@ -755,13 +815,7 @@ class Equivalence:
         - p → T = T
         - p → F = ~p
         """
-        root = proposition.root
-        if not isinstance(root, OperatorNode):
-            return False
-        if root.operator.name != '__rshift__' or root.right is None:
-            return False
-
-        return (self._is_constant(root.left) or self._is_constant(root.right))
+        return self._match_implication_constant(proposition.root) is not None
 
     def apply_implication_constant(self, proposition: CompoundProposition) -> CompoundProposition:
         """
@@ -771,45 +825,126 @@ class Equivalence:
         - p → T -> T
         - p → F -> ~p
         """
-        if not self.check_implication_constant(proposition):
+        match = self._match_implication_constant(proposition.root)
+        if match is None:
             return proposition
 
-        root = proposition.root
-        left = root.left
-        right = root.right
+        operand, negate = match
+        if operand is TRUE:
+            return TRUE
+        if negate:
+            return self._node_to_compound(self._mk_op(Proposition.__invert__, operand))
+        return self._node_to_compound(operand)
 
-        # T → p -> p
-        if self._is_true_constant(left):
-            return self._node_to_compound(right)
+    # ==================== Law Dispatch ====================
 
-        # F → p -> T
-        if self._is_false_constant(left):
-            return TRUE
+    def applicable_laws(self, proposition: CompoundProposition) -> list:
+        """
+        Return the names of the laws that can be applied at the root.
 
-        # p → T -> T
-        if self._is_true_constant(right):
-            return TRUE
+        Only the laws whose pattern starts with the root operator are
+        tried, instead of running every check_* in turn.
 
-        # p → F -> ~p
-        if self._is_false_constant(right):
-            return CompoundProposition(Proposition.__invert__, self._node_to_compound(left))
+        Example:
+            >>> eq.applicable_laws(parse_proposition("~~p")[0])
+            ['double_negation']
+        """
+        root = proposition.root
+        if root is None or not root.is_op:
+            return []
+        return [
+            name for name in _LAWS_BY_ROOT_OP[root.operator.op_id]
+            if _LAW_MATCHERS[name](self, root) is not None
+        ]
+
+    def check_batch(self, law: str, propositions) -> list:
+        """
+        Test one law against many propositions at once.
 
-        return proposition
+        The matcher of the law is looked up once and run on every root,
+        instead of going through check_* and its wrapper per proposition.
+        Gives the same answers as calling check_<law> on each of them.
+
+        Example:
+            >>> eq.check_batch('de_morgan', [parse_proposition(s)[0] for s in ("~(p ^ q)", "~~p")])
+            [True, False]
+        """
+        match = _LAW_MATCHERS[law]
+        results = []
+        for proposition in propositions:
+            root = getattr(proposition, 'root', None)
+            results.append(root is not None and root.is_op and match(self, root) is not None)
+        return results
 
     # ==================== Helper Methods ====================
 
     def _node_to_compound(self, node: PropositionNode):
-        """Convert a node back to a CompoundProposition or Proposition."""
+        """
+        Convert a node back to a CompoundProposition or Proposition.
+
+        Nodes are never modified after construction, so the compound wraps
+        the existing subtree instead of copying it. Rewrites therefore share
+        their unchanged subtrees with the input, and comparing them later
+        stops at the identity check in _nodes_equal. The only walk left
+        is the iterative one collecting the components.
+        """
         if isinstance(node, AtomicNode):
             # Return the raw proposition (Proposition or TruthConstant)
             # The caller may need to wrap it in _ensure_compound if needed
             return node.proposition
         elif isinstance(node, OperatorNode):
-            left = self._node_to_compound(node.left)
-            right = self._node_to_compound(node.right) if node.right else None
-            return CompoundProposition(node.operator, left, right)
+            compound = CompoundProposition()
+            compound.root = node
+            compound.components = node.get_components()
+            return compound
+        return node
+
+    def _mk_op(self, operator, left: PropositionNode, right: PropositionNode = None) -> OperatorNode:
+        """
+        Return the operator node over left and right, reusing the node
+        built earlier for the same operator and children.
+
+        Rewrites often rebuild a node that already exists (commutativity
+        applied twice, De Morgan undone by its reverse, both sides reaching
+        the same form). Getting the same object back lets _nodes_equal stop
+        at the identity check and the per-node caches answer at once.
+        """
+        key = (operator.op_id, id(left), id(right))
+        node = self._op_intern.get(key)
+        if node is None:
+            if len(self._op_intern) >= _INTERN_SIZE:
+                self._op_intern.clear()
+            # The entry keeps the children alive, so their ids stay valid
+            node = OperatorNode(operator, left, right)
+            self._op_intern[key] = node
         return node
 
+    def _negated(self, node: PropositionNode):
+        """
+        Return the node ~node, or x when node is already ~x.
+
+        De Morgan and contraposition negate their operands; for an operand
+        that is a negation this skips building ~~x, which double negation
+        would remove in the next step anyway.
+        """
+        if node.arity == 1 and node.operator.op_id == OP_NOT:
+            return node.left
+        return self._mk_op(Proposition.__invert__, node)
+
+    def _constant_node(self, constant) -> AtomicNode:
+        """
+        Return the leaf shared by every rewrite to T or F, so that the
+        nodes rebuilt above it are interned by _mk_op like any other.
+        """
+        return self._true_prop.root if constant is TRUE else self._false_prop.root
+
+    def _constant_compound(self, constant) -> CompoundProposition:
+        """Wrap T or F as a compound proof target."""
+        target = CompoundProposition()
+        target.root = AtomicNode(constant)
+        target.components = {constant}
+        return target
+
     def _node_to_compound_safe(self, node: PropositionNode) -> CompoundProposition:
         """Convert a node to a CompoundProposition, ensuring it's always compound."""
         result = self._node_to_compound(node)
@@ -819,7 +954,19 @@ class Equivalence:
         return self._ensure_compound(result)
 
     def _nodes_equal(self, node1: PropositionNode, node2: PropositionNode) -> bool:
-        """Check if two nodes represent the same proposition structure."""
+        """
+        Check if two nodes represent the same proposition structure.
+
+        Nodes are never modified after construction, so the result for a
+        pair of operator nodes is memoized by identity: the checks probe
+        the same subtree pairs over and over while searching for a law.
+        """
+        if node1 is node2:
+            return True
+        if node1._hash != node2._hash:
+            # Different structural hashes, the trees cannot be equal
+            return False
+
         if type(node1) != type(node2):
             return False
 
@@ -827,18 +974,34 @@ class Equivalence:
             return node1.proposition.text == node2.proposition.text
 
         if isinstance(node1, OperatorNode):
-            if node1.operator.name != node2.operator.name:
-                return False
-            if not self._nodes_equal(node1.left, node2.left):
-                return False
-            if node1.right is None and node2.right is None:
-                return True
-            if node1.right is None or node2.right is None:
-                return False
-            return self._nodes_equal(node1.right, node2.right)
+            id1 = id(node1)
+            id2 = id(node2)
+            key = (id1, id2) if id1 < id2 else (id2, id1)
+            cached = self._eq_cache.get(key)
+            if cached is not None:
+                return cached[2]
+
+            result = self._operator_nodes_equal(node1, node2)
+
+            if len(self._eq_cache) >= _EQ_CACHE_SIZE:
+                self._eq_cache.clear()
+            self._eq_cache[key] = (node1, node2, result)
+            return result
 
         return False
 
+    def _operator_nodes_equal(self, node1: OperatorNode, node2: OperatorNode) -> bool:
+        """Structural comparison of two operator nodes."""
+        if node1.operator.op_id != node2.operator.op_id:
+            return False
+        if not self._nodes_equal(node1.left, node2.left):
+            return False
+        if node1.right is None and node2.right is None:
+            return True
+        if node1.right is None or node2.right is None:
+            return False
+        return self._nodes_equal(node1.right, node2.right)
+
     # ==================== Syntactic Equality ====================
 
     def are_equal(self, prop1, prop2) -> bool:
@@ -852,8 +1015,15 @@ class Equivalence:
         Returns:
             True if both propositions have the same structure and symbols
         """
-        node1 = self._to_node(prop1)
-        node2 = self._to_node(prop2)
+        if prop1 is prop2:
+            return True
+
+        # Compound propositions already hold their tree
+        node1 = prop1.root if isinstance(prop1, CompoundProposition) else self._to_node(prop1)
+        node2 = prop2.root if isinstance(prop2, CompoundProposition) else self._to_node(prop2)
+        if node1 is None or node2 is None:
+            # An empty compound is only equal to another empty one
+            return node1 is node2
         return self._nodes_equal(node1, node2)
 
     def _to_node(self, prop) -> PropositionNode:
@@ -866,10 +1036,50 @@ class Equivalence:
             return prop.root
         raise TypeError(f"Cannot convert {type(prop)} to node")
 
+    # ==================== Semantic Equivalence ====================
+
+    def are_equivalent(self, prop1, prop2) -> bool:
+        """
+        Check if two propositions have the same truth table.
+
+        This decides equivalence exactly, without searching for a sequence
+        of laws: both propositions are evaluated on every row at once as
+        bit vectors (see utils.proposition.evaluator), which costs 2 ** n
+        bits for n distinct atoms.
+
+        Args:
+            prop1: First proposition (Proposition or CompoundProposition)
+            prop2: Second proposition (Proposition or CompoundProposition)
+
+        Returns:
+            True if both propositions agree on every assignment of their atoms
+        """
+        names = self._atom_names(prop1, prop2)
+        return truth_table_bits(prop1, names) == truth_table_bits(prop2, names)
+
+    def _atom_names(self, prop1, prop2) -> list:
+        """Sorted names of the non-constant atoms of both propositions."""
+        components = self._to_node(prop1).get_components() | self._to_node(prop2).get_components()
+        return sorted({c.text for c in components if not c.is_constant()})
+
+    def _tables_differ(self, prop1, prop2) -> bool:
+        """
+        Whether the provers can stop early because the truth tables differ.
+
+        Only compares the tables of at most _TABLE_CHECK_MAX_VARIABLES
+        atoms; above that the table is too large to build upfront and this
+        returns False, leaving the bounded search to fail on its own.
+        """
+        names = self._atom_names(prop1, prop2)
+        if len(names) > _TABLE_CHECK_MAX_VARIABLES:
+            return False
+        return truth_table_bits(prop1, names) != truth_table_bits(prop2, names)
+
     # ==================== Brute Force Equivalence Prover ====================
 
     def prove_equivalence(self, prop1: CompoundProposition, prop2: CompoundProposition,
-                          max_iterations: int = 100, verbose: bool = False) -> dict:
+                          max_iterations: int = 100, verbose: bool = False,
+                          record_strings: bool = True) -> dict:
         """
         Try to prove that two propositions are equivalent by randomly applying
         equivalence laws until they become syntactically equal.
@@ -879,6 +1089,9 @@ class Equivalence:
             prop2: Second compound proposition
             max_iterations: Maximum number of transformation attempts (default: 100)
             verbose: If True, print each transformation step
+            record_strings: If False, the transformations leave out the
+                'result', 'p1' and 'p2' texts, for callers that never read them;
+                'result_prop' always holds the resulting proposition
 
         Returns:
             dict with keys:
@@ -888,64 +1101,51 @@ class Equivalence:
                 - 'prop2_final': The final form of prop2
                 - 'transformations': List of transformations applied
         """
-        transformations = [
-            # High priority: Simplification operations
-            ('double_negation', self.check_double_negation, self.apply_double_negation),
-            ('idempotence', self.check_idempotence, self.apply_idempotence),
-            ('absorption', self.check_absorption, self.apply_absorption),
-            ('factoring', self.check_factoring, self.apply_factoring),  # Reverse distributivity (simplifies)
-            # Truth constant laws (simplification)
-            ('identity', self.check_identity, self.apply_identity),
-            ('domination', self.check_domination, self.apply_domination),
-            ('negation_constant', self.check_negation_constant, self.apply_negation_constant),
-            ('complement', self.check_complement, self.apply_complement),
-            ('implication_constant', self.check_implication_constant, self.apply_implication_constant),
-            # Structure transformations
-            ('de_morgan', self.check_de_morgan, self.apply_de_morgan),
-            ('commutativity', self.check_commutativity, self.apply_commutativity),
-            ('implication_elimination', self.check_implication_elimination, self.apply_implication_elimination),
-            ('implication_introduction', self.check_implication_introduction, self.apply_implication_introduction),
-            ('contraposition', self.check_contraposition, self.apply_contraposition),
-            # Lower priority (can increase complexity)
-            ('de_morgan_reverse', self.check_de_morgan_reverse, self.apply_de_morgan_reverse),
-            ('distributivity', self.check_distributivity, self.apply_distributivity),
-        ]
-
         current1 = self._ensure_compound(prop1)
         current2 = self._ensure_compound(prop2)
         applied_transformations = []
 
+        memo_key = (None, current1.root._hash, current2.root._hash, record_strings)
+        cached = self._cached_proof(memo_key, current1, current2, max_iterations)
+        if cached is not None:
+            return cached
+        start = (current1, current2)
+
+        seen = self._new_seen(current1, current2)
+
         if verbose:
             print(f"Iniciando prova:")
             print(f"  Prop 1: {current1}")
             print(f"  Prop 2: {current2}")
             print()
 
-        # Separate transformations by priority
-        simplification_transforms = self._get_simplification_transformations()
-        structure_transforms = self._get_structure_transformations()
-        expansion_transforms = self._get_expansion_transformations()
+        # Separate transformations by priority, each with the bit of its law
+        # in the mask returned by _subtree_laws
+        simplification_transforms, structure_transforms, expansion_transforms = self._law_tiers()
 
         for iteration in range(max_iterations):
             if self.are_equal(current1, current2):
                 if verbose:
                     print(f"\nProposições são iguais após {iteration} iterações!")
-                return {
+                return self._remember_proof(memo_key, start, {
                     'success': True,
                     'iterations': iteration,
                     'prop1_final': current1,
                     'prop2_final': current2,
                     'transformations': applied_transformations
-                }
+                })
 
             which_prop = random.choice([1, 2])
             current_prop = current1 if which_prop == 1 else current2
 
+            # Every law applicable anywhere in the proposition, in one lookup
+            laws = self._subtree_laws(current_prop.root)
+
             # Priority 1: Try simplification transformations first (in order)
             applied = False
             matched_subexpr = None
-            for name, check_fn, apply_fn in simplification_transforms:
-                if self._can_apply_anywhere(current_prop, check_fn):
+            for name, check_fn, apply_fn, bit in simplification_transforms:
+                if laws & bit:
                     new_prop, matched_subexpr = self._apply_random_transformation_with_location(current_prop, check_fn, apply_fn)
                     applied = True
                     break
@@ -954,8 +1154,8 @@ class Equivalence:
             if not applied:
                 applicable_structure = [
                     (name, check_fn, apply_fn)
-                    for name, check_fn, apply_fn in structure_transforms
-                    if self._can_apply_anywhere(current_prop, check_fn)
+                    for name, check_fn, apply_fn, bit in structure_transforms
+                    if laws & bit
                 ]
                 if applicable_structure:
                     name, check_fn, apply_fn = random.choice(applicable_structure)
@@ -966,8 +1166,8 @@ class Equivalence:
             if not applied and random.random() < 0.1:
                 applicable_expansion = [
                     (name, check_fn, apply_fn)
-                    for name, check_fn, apply_fn in expansion_transforms
-                    if self._can_apply_anywhere(current_prop, check_fn)
+                    for name, check_fn, apply_fn, bit in expansion_transforms
+                    if laws & bit
                 ]
                 if applicable_expansion:
                     name, check_fn, apply_fn = random.choice(applicable_expansion)
@@ -982,27 +1182,44 @@ class Equivalence:
             else:
                 current2 = new_prop
 
-            applied_transformations.append({
-                'iteration': iteration,
-                'proposition': which_prop,
-                'law': name,
-                'result': str(new_prop),
-                'matched_subexpr': matched_subexpr,
-                'p1': str(current1),
-                'p2': str(current2)
-            })
+            if record_strings:
+                applied_transformations.append({
+                    'iteration': iteration,
+                    'proposition': which_prop,
+                    'law': name,
+                    'result': str(new_prop),
+                    'matched_subexpr': matched_subexpr,
+                    'p1': str(current1),
+                    'p2': str(current2),
+                    'result_prop': new_prop
+                })
+            else:
+                applied_transformations.append({
+                    'iteration': iteration,
+                    'proposition': which_prop,
+                    'law': name,
+                    'matched_subexpr': matched_subexpr,
+                    'result_prop': new_prop
+                })
 
             if verbose:
                 print(f"[{iteration}] Aplicado {name} em prop{which_prop}: {new_prop}")
 
+            met = self._meet(seen, which_prop, new_prop, applied_transformations)
+            if met is not None:
+                if which_prop == 1:
+                    current2, applied_transformations = met
+                else:
+                    current1, applied_transformations = met
+
         if self.are_equal(current1, current2):
-            return {
+            return self._remember_proof(memo_key, start, {
                 'success': True,
                 'iterations': max_iterations,
                 'prop1_final': current1,
                 'prop2_final': current2,
                 'transformations': applied_transformations
-            }
+            })
 
         if verbose:
             print(f"\nFalha ao provar equivalência após {max_iterations} iterações.")
@@ -1017,6 +1234,102 @@ class Equivalence:
             'transformations': applied_transformations
         }
 
+    def _predict_pair(self, predictor, predictions: dict, prop1, prop2) -> tuple:
+        """
+        Return predictor.predict(prop1, prop2), asking the predictor only
+        the first time the pair is seen during a proof.
+        """
+        key = (prop1.root._hash, prop2.root._hash)
+        entry = predictions.get(key)
+        if entry is not None and self.are_equal(entry[0], prop1) and self.are_equal(entry[1], prop2):
+            return entry[2]
+        prediction = predictor.predict(prop1, prop2)
+        predictions[key] = (prop1, prop2, prediction)
+        return prediction
+
+    def _predict_form(self, predictor, predictions: dict, prop, goal: str) -> str:
+        """
+        Return predictor.predict(prop, goal=goal), asking the predictor only
+        the first time the form is seen during a simplification.
+        """
+        key = prop.root._hash
+        entry = predictions.get(key)
+        if entry is not None and self.are_equal(entry[0], prop):
+            return entry[1]
+        prediction = predictor.predict(prop, goal=goal)
+        predictions[key] = (prop, prediction)
+        return prediction
+
+    def _cached_proof(self, key: tuple, prop1, prop2, max_iterations: int):
+        """
+        Return a copy of the successful proof remembered for this pair, or
+        None when there is none that fits in max_iterations.
+        """
+        entry = self._proof_memo.get(key)
+        if entry is None:
+            return None
+        (start1, start2), result = entry
+        if result['iterations'] > max_iterations:
+            return None
+        # Keys are structural hashes: make sure the pair really is the same
+        if not (self.are_equal(start1, prop1) and self.are_equal(start2, prop2)):
+            return None
+        return self._copy_proof(result)
+
+    def _remember_proof(self, key: tuple, start: tuple, result: dict) -> dict:
+        """Remember a successful proof of the pair start and return it."""
+        if len(self._proof_memo) >= _PROOF_MEMO_SIZE:
+            self._proof_memo.clear()
+        self._proof_memo[key] = (start, self._copy_proof(result))
+        return result
+
+    def _copy_proof(self, result: dict) -> dict:
+        """Copy a proof result deep enough that callers cannot alter the memo."""
+        return dict(result, transformations=[dict(t) for t in result['transformations']])
+
+    def _new_seen(self, prop1: CompoundProposition, prop2: CompoundProposition) -> dict:
+        """
+        Return the forms each side of a proof has been in, for _meet:
+        side -> structural hash -> (form, number of logged steps when it
+        was first reached).
+        """
+        return {
+            1: {prop1.root._hash: (prop1, 0)},
+            2: {prop2.root._hash: (prop2, 0)},
+        }
+
+    def _meet(self, seen: dict, side: int, new_prop: CompoundProposition, transformations: list):
+        """
+        Record the form `side` just reached, after its step was logged.
+
+        When the other side went through that form earlier, both meet
+        there: return (form, transformations) with the other side taken
+        back to that form and its later steps dropped from the log.
+        Otherwise return None.
+        """
+        other = 3 - side
+        met = seen[other].get(new_prop.root._hash)
+        if met is not None and self.are_equal(met[0], new_prop):
+            met_form, met_step = met
+            return met_form, self._rewind_side(transformations, other, met_step, met_form)
+        seen[side].setdefault(new_prop.root._hash, (new_prop, len(transformations)))
+        return None
+
+    def _rewind_side(self, transformations: list, side: int, step: int, form) -> list:
+        """
+        Drop the steps of one side logged after the first `step` entries,
+        leaving that side in `form` for the rest of the log.
+        """
+        key = 'p1' if side == 1 else 'p2'
+        rewound = transformations[:step]
+        for t in transformations[step:]:
+            if t['proposition'] != side:
+                # Logs recorded without strings have nothing to rewrite
+                if key in t:
+                    t[key] = str(form)
+                rewound.append(t)
+        return rewound
+
     def _ensure_compound(self, prop) -> CompoundProposition:
         """Ensure the proposition is a CompoundProposition."""
         if isinstance(prop, CompoundProposition):
@@ -1032,33 +1345,123 @@ class Equivalence:
     def _can_apply_anywhere(self, prop, check_fn) -> bool:
         """Check if a transformation can be applied anywhere in the tree."""
         # Handle non-CompoundProposition inputs
-        if not isinstance(prop, CompoundProposition):
-            return False
-
-        if check_fn(prop):
-            return True
-
-        if prop.root is None:
+        if not isinstance(prop, CompoundProposition) or prop.root is None:
             return False
 
+        # The root is one of the subtrees, and the answer for it is
+        # memoized there along with the rest of the tree
         return self._can_apply_to_subtree(prop.root, check_fn)
 
     def _can_apply_to_subtree(self, node: PropositionNode, check_fn) -> bool:
-        """Recursively check if transformation can be applied to any subtree."""
-        if isinstance(node, AtomicNode):
-            return False
-
-        if isinstance(node, OperatorNode):
-            sub_prop = self._node_to_compound(node)
-            if isinstance(sub_prop, CompoundProposition) and check_fn(sub_prop):
+        """Check if transformation can be applied to any subtree."""
+        match = _NODE_MATCHERS.get(getattr(check_fn, '__func__', None))
+        if match is not None:
+            return bool(self._subtree_laws(node) & _MATCHER_BITS[match])
+
+        node_check = self._node_check(check_fn)
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not node.is_op:
+                continue
+            if node_check(node):
                 return True
+            stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        return False
 
-            if self._can_apply_to_subtree(node.left, check_fn):
-                return True
-            if node.right and self._can_apply_to_subtree(node.right, check_fn):
-                return True
+    def _law_tiers(self) -> tuple:
+        """
+        Return the simplification, structure and expansion transformations
+        passed through _with_law_bits.
 
-        return False
+        The tiers never change, so they are built once per instance
+        instead of on every proof.
+        """
+        if self._tiers is None:
+            self._tiers = (
+                self._with_law_bits(self._get_simplification_transformations()),
+                self._with_law_bits(self._get_structure_transformations()),
+                self._with_law_bits(self._get_expansion_transformations()),
+            )
+        return self._tiers
+
+    def _transformations_by_name(self) -> dict:
+        """Return law name -> (check_fn, apply_fn) for every law, built once per instance."""
+        if self._by_name is None:
+            self._by_name = {
+                name: (getattr(self, 'check_' + name), getattr(self, 'apply_' + name))
+                for name in _LAW_MATCHERS
+            }
+        return self._by_name
+
+    def _with_law_bits(self, transforms: list) -> list:
+        """
+        Append to each (name, check_fn, apply_fn) the bit of its law in the
+        mask returned by _subtree_laws.
+        """
+        return [
+            (name, check_fn, apply_fn, _MATCHER_BITS[_NODE_MATCHERS[check_fn.__func__]])
+            for name, check_fn, apply_fn in transforms
+        ]
+
+    def _root_laws(self, node: OperatorNode) -> int:
+        """Return the _MATCHER_BITS of every _match_* helper accepting node."""
+        laws = self._constant_laws(node)
+        for match, bit in _MATCHERS_BY_SHAPE[node._shape]:
+            if match(self, node) is not None:
+                laws |= bit
+        return laws
+
+    def _subtree_laws(self, node: PropositionNode) -> int:
+        """
+        Return the _MATCHER_BITS of every law applicable anywhere in node.
+
+        One walk answers the queries of all the laws, which the provers ask
+        one after the other. The answer is memoized by node identity: nodes
+        never change and a rewrite shares every subtree off the rewritten
+        path with its input, so from one proof step to the next only that
+        path is scanned again.
+        """
+        if not node.is_op:
+            return 0
+
+        key = id(node)
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            return cached[1]
+
+        laws = self._root_laws(node) | self._subtree_laws(node.left)
+        if node.right is not None:
+            laws |= self._subtree_laws(node.right)
+
+        if len(self._match_cache) >= _MATCH_CACHE_SIZE:
+            self._match_cache.clear()
+        # The node is kept in the entry so its id cannot be reused
+        self._match_cache[key] = (node, laws)
+        return laws
+
+    def _node_check(self, check_fn):
+        """
+        Return a predicate testing check_fn directly on an operator node.
+
+        The check_* methods only look at the root through their _match_*
+        helper, so subtrees are matched in place instead of being copied
+        into a new CompoundProposition first. Any other callable receives
+        the copied subtree.
+        """
+        match = _NODE_MATCHERS.get(getattr(check_fn, '__func__', None))
+        if match is None:
+            return lambda node: node.is_op and check_fn(self._node_to_compound(node))
+        # Nodes whose operator cannot start the pattern are rejected
+        # without calling the matcher
+        root_ops = _MATCHER_ROOT_OPS[match]
+        return lambda node: (
+            node.is_op
+            and (root_ops >> node.operator.op_id) & 1
+            and match(self, node) is not None
+        )
 
     def _apply_random_transformation(self, prop: CompoundProposition, check_fn, apply_fn) -> CompoundProposition:
         """Apply transformation at a random applicable location in the tree."""
@@ -1070,19 +1473,15 @@ class Equivalence:
         Apply transformation at a random applicable location in the tree.
         Returns: (new_proposition, matched_subexpression_string)
         """
-        applicable_locations = []
-
-        if check_fn(prop):
-            applicable_locations.append('root')
-
-        self._find_applicable_locations(prop.root, check_fn, [], applicable_locations)
+        # The root and its subtrees are matched in the same walk
+        applicable_locations = list(self._iter_matches(prop.root, check_fn))
 
         if not applicable_locations:
             return prop, None
 
         location = random.choice(applicable_locations)
 
-        if location == 'root':
+        if not location:
             # Don't show subexpression when applied to entire proposition
             result = apply_fn(prop)
             # Ensure result is always a CompoundProposition
@@ -1106,8 +1505,8 @@ class Equivalence:
                     node = node.right
             else:
                 break
-        sub_prop = self._node_to_compound(node)
-        return str(sub_prop) if sub_prop else None
+        # Only the text is needed, the node prints the same as its compound
+        return str(node) if node is not None else None
 
     def _get_simplification_transformations(self):
         """Return transformations that simplify (reduce complexity)."""
@@ -1141,62 +1540,85 @@ class Equivalence:
             ('implication_introduction', self.check_implication_introduction, self.apply_implication_introduction),
         ]
 
-    def _find_applicable_locations(self, node: PropositionNode, check_fn, path: list, locations: list):
-        """Find all paths where the transformation can be applied."""
-        if isinstance(node, AtomicNode):
-            return
-
-        if isinstance(node, OperatorNode):
-            if node.left:
-                sub_prop = self._node_to_compound(node.left)
-                if isinstance(sub_prop, CompoundProposition) and check_fn(sub_prop):
-                    locations.append(path + ['left'])
-                self._find_applicable_locations(node.left, check_fn, path + ['left'], locations)
+    def _iter_matches(self, node: PropositionNode, check_fn):
+        """
+        Yield the path of every subtree of node accepted by check_fn, node
+        itself first with the empty path, in pre-order, left before right.
 
-            if node.right:
-                sub_prop = self._node_to_compound(node.right)
-                if isinstance(sub_prop, CompoundProposition) and check_fn(sub_prop):
-                    locations.append(path + ['right'])
-                self._find_applicable_locations(node.right, check_fn, path + ['right'], locations)
+        With the law bit of the check, subtrees whose _subtree_laws mask
+        does not contain it are skipped without being walked.
+        """
+        match = _NODE_MATCHERS.get(getattr(check_fn, '__func__', None))
+        law_bit = _MATCHER_BITS[match] if match is not None else None
+        node_check = self._node_check(check_fn)
+
+        stack = [(node, ())]
+        while stack:
+            node, path = stack.pop()
+            if not node or not node.is_op:
+                continue
+            if law_bit is not None and not self._subtree_laws(node) & law_bit:
+                continue
+            if node_check(node):
+                yield path
+            # Right pushed first so the left subtree is walked first
+            stack.append((node.right, path + ('right',)))
+            stack.append((node.left, path + ('left',)))
 
     def _apply_at_path(self, prop: CompoundProposition, path: list, apply_fn) -> CompoundProposition:
-        """Apply transformation at a specific path in the tree."""
-        new_root = self._apply_at_path_recursive(prop.root, path, apply_fn)
-        result = CompoundProposition()
-        result.root = new_root
-        result.components = new_root.get_components() if new_root else set()
-        return result
+        """
+        Apply transformation at a specific path in the tree.
 
-    def _apply_at_path_recursive(self, node: PropositionNode, path: list, apply_fn) -> PropositionNode:
-        """Recursively navigate to path and apply transformation."""
-        if not path:
-            sub_prop = self._node_to_compound(node)
-            if isinstance(sub_prop, CompoundProposition):
-                result = apply_fn(sub_prop)
-                if isinstance(result, CompoundProposition):
-                    return result.root
-                elif isinstance(result, Proposition):
-                    return AtomicNode(result)
-            return node
-
-        if isinstance(node, OperatorNode):
-            direction = path[0]
-            remaining_path = path[1:]
+        Only the nodes along the path are rebuilt, bottom up, and every
+        subtree off the path is shared with prop.
+        """
+        # Walk down, remembering the parents and the side taken
+        spine = []
+        node = prop.root
+        for direction in path:
+            if not isinstance(node, OperatorNode):
+                break
+            spine.append((node, direction))
+            node = node.left if direction == 'left' else node.right
+        else:
+            node = self._apply_at_node(node, apply_fn)
 
+        # Rebuild the path on top of the new subtree
+        for parent, direction in reversed(spine):
             if direction == 'left':
-                new_left = self._apply_at_path_recursive(node.left, remaining_path, apply_fn)
-                return OperatorNode(node.operator, new_left, node.right)
-            elif direction == 'right':
-                new_right = self._apply_at_path_recursive(node.right, remaining_path, apply_fn)
-                return OperatorNode(node.operator, node.left, new_right)
+                node = self._mk_op(parent.operator, node, parent.right)
+            else:
+                node = self._mk_op(parent.operator, parent.left, node)
+
+        result = CompoundProposition()
+        result.root = node
+        result.components = node.get_components() if node else set()
+        return result
 
+    def _apply_at_node(self, node: PropositionNode, apply_fn) -> PropositionNode:
+        """Apply transformation to the subtree rooted at node."""
+        # Complement, domination and negation of a constant replace the
+        # subtree with the constant their match returns: take it from the
+        # node directly, without wrapping the subtree in a compound
+        match = _CONSTANT_RESULT_MATCHERS.get(getattr(apply_fn, '__func__', None))
+        if match is not None:
+            constant = match(self, node)
+            return node if constant is None else self._constant_node(constant)
+
+        sub_prop = self._node_to_compound(node)
+        if isinstance(sub_prop, CompoundProposition):
+            result = apply_fn(sub_prop)
+            if isinstance(result, CompoundProposition):
+                return result.root
+            elif isinstance(result, Proposition):
+                return AtomicNode(result)
         return node
 
     # ==================== Neural Network Guided Prover ====================
 
     def prove_equivalence_nn(self, prop1: CompoundProposition, prop2: CompoundProposition,
                               predictor, max_iterations: int = 100,
-                              verbose: bool = False) -> dict:
+                              verbose: bool = False, record_strings: bool = True) -> dict:
         """
         Prove equivalence using neural network to guide transformations.
 
@@ -1209,6 +1631,9 @@ class Equivalence:
             predictor: Trained TransformationPredictor instance
             max_iterations: Maximum number of transformation attempts
             verbose: If True, print each transformation step
+            record_strings: If False, the transformations leave out the
+                'result', 'p1' and 'p2' texts, for callers that never read them;
+                'result_prop' always holds the resulting proposition
 
         Returns:
             dict with keys:
@@ -1219,35 +1644,27 @@ class Equivalence:
                 - 'transformations': List of transformations applied
                 - 'nn_predictions_used': Number of times NN prediction was used
         """
-        transformations = {
-            # Simplification operations
-            'double_negation': (self.check_double_negation, self.apply_double_negation),
-            'idempotence': (self.check_idempotence, self.apply_idempotence),
-            'absorption': (self.check_absorption, self.apply_absorption),
-            'factoring': (self.check_factoring, self.apply_factoring),  # Reverse distributivity
-            # Truth constant laws
-            'identity': (self.check_identity, self.apply_identity),
-            'domination': (self.check_domination, self.apply_domination),
-            'negation_constant': (self.check_negation_constant, self.apply_negation_constant),
-            'complement': (self.check_complement, self.apply_complement),
-            'implication_constant': (self.check_implication_constant, self.apply_implication_constant),
-            # Structure transformations
-            'de_morgan': (self.check_de_morgan, self.apply_de_morgan),
-            'commutativity': (self.check_commutativity, self.apply_commutativity),
-            'associativity': (self.check_associativity, self.apply_associativity),
-            'implication_elimination': (self.check_implication_elimination, self.apply_implication_elimination),
-            'implication_introduction': (self.check_implication_introduction, self.apply_implication_introduction),
-            'contraposition': (self.check_contraposition, self.apply_contraposition),
-            # Lower priority
-            'de_morgan_reverse': (self.check_de_morgan_reverse, self.apply_de_morgan_reverse),
-            'distributivity': (self.check_distributivity, self.apply_distributivity),
-        }
+        transformations = self._transformations_by_name()
 
         current1 = self._ensure_compound(prop1)
         current2 = self._ensure_compound(prop2)
         applied_transformations = []
         nn_predictions_used = 0
 
+        memo_key = (predictor, current1.root._hash, current2.root._hash, record_strings)
+        cached = self._cached_proof(memo_key, current1, current2, max_iterations)
+        if cached is not None:
+            return cached
+        start = (current1, current2)
+        seen = self._new_seen(current1, current2)
+        # The prediction depends only on the pair, which the search often
+        # comes back to: (hash1, hash2) -> (prop1, prop2, prediction)
+        predictions = {}
+
+        # Fallback tiers, each transformation with the bit of its law in
+        # the mask returned by _subtree_laws
+        simplification_transforms, structure_transforms, expansion_transforms = self._law_tiers()
+
         if verbose:
             print(f"Iniciando prova guiada por NN:")
             print(f"  Prop 1: {current1}")
@@ -1259,17 +1676,17 @@ class Equivalence:
                 if verbose:
                     print(f"\nProposições são iguais após {iteration} iterações!")
                     print(f"Predições NN usadas: {nn_predictions_used}")
-                return {
+                return self._remember_proof(memo_key, start, {
                     'success': True,
                     'iterations': iteration,
                     'prop1_final': current1,
                     'prop2_final': current2,
                     'transformations': applied_transformations,
                     'nn_predictions_used': nn_predictions_used
-                }
+                })
 
             # Get NN prediction
-            which_prop, transform_name = predictor.predict(current1, current2)
+            which_prop, transform_name = self._predict_pair(predictor, predictions, current1, current2)
             current_prop = current1 if which_prop == 1 else current2
 
             # Check if prediction is applicable
@@ -1277,7 +1694,7 @@ class Equivalence:
             matched_subexpr = None
             if transform_name in transformations:
                 check_fn, apply_fn = transformations[transform_name]
-                if self._can_apply_anywhere(current_prop, check_fn):
+                if self._subtree_laws(current_prop.root) & _LAW_BITS[transform_name]:
                     new_prop, matched_subexpr = self._apply_random_transformation_with_location(current_prop, check_fn, apply_fn)
                     used_nn = True
                     nn_predictions_used += 1
@@ -1286,12 +1703,16 @@ class Equivalence:
             # Use same priority as regular prover: simplification > structure > expansion
             if not used_nn:
                 applied = False
+                # Every law applicable anywhere in each side, in one lookup
+                sides = [
+                    (1, current1, self._subtree_laws(current1.root)),
+                    (2, current2, self._subtree_laws(current2.root)),
+                ]
 
                 # Priority 1: Try simplification transformations (in order)
-                simplification_transforms = self._get_simplification_transformations()
-                for t_name, check_fn, apply_fn in simplification_transforms:
-                    for prop_idx, prop in [(1, current1), (2, current2)]:
-                        if self._can_apply_anywhere(prop, check_fn):
+                for t_name, check_fn, apply_fn, bit in simplification_transforms:
+                    for prop_idx, prop, laws in sides:
+                        if laws & bit:
                             new_prop, matched_subexpr = self._apply_random_transformation_with_location(prop, check_fn, apply_fn)
                             which_prop = prop_idx
                             transform_name = t_name
@@ -1302,11 +1723,10 @@ class Equivalence:
 
                 # Priority 2: Try structure transformations (random among applicable)
                 if not applied:
-                    structure_transforms = self._get_structure_transformations()
                     applicable_structure = []
-                    for t_name, check_fn, apply_fn in structure_transforms:
-                        for prop_idx, prop in [(1, current1), (2, current2)]:
-                            if self._can_apply_anywhere(prop, check_fn):
+                    for t_name, check_fn, apply_fn, bit in structure_transforms:
+                        for prop_idx, prop, laws in sides:
+                            if laws & bit:
                                 applicable_structure.append((t_name, check_fn, apply_fn, prop_idx, prop))
 
                     if applicable_structure:
@@ -1317,11 +1737,10 @@ class Equivalence:
 
                 # Priority 3: Expansion only with 10% chance
                 if not applied and random.random() < 0.1:
-                    expansion_transforms = self._get_expansion_transformations()
                     applicable_expansion = []
-                    for t_name, check_fn, apply_fn in expansion_transforms:
-                        for prop_idx, prop in [(1, current1), (2, current2)]:
-                            if self._can_apply_anywhere(prop, check_fn):
+                    for t_name, check_fn, apply_fn, bit in expansion_transforms:
+                        for prop_idx, prop, laws in sides:
+                            if laws & bit:
                                 applicable_expansion.append((t_name, check_fn, apply_fn, prop_idx, prop))
 
                     if applicable_expansion:
@@ -1338,31 +1757,49 @@ class Equivalence:
             else:
                 current2 = new_prop
 
-            applied_transformations.append({
-                'iteration': iteration,
-                'proposition': which_prop,
-                'law': transform_name,
-                'result': str(new_prop),
-                'used_nn': used_nn,
-                'matched_subexpr': matched_subexpr,
-                'p1': str(current1),
-                'p2': str(current2)
-            })
+            if record_strings:
+                applied_transformations.append({
+                    'iteration': iteration,
+                    'proposition': which_prop,
+                    'law': transform_name,
+                    'result': str(new_prop),
+                    'used_nn': used_nn,
+                    'matched_subexpr': matched_subexpr,
+                    'p1': str(current1),
+                    'p2': str(current2),
+                    'result_prop': new_prop
+                })
+            else:
+                applied_transformations.append({
+                    'iteration': iteration,
+                    'proposition': which_prop,
+                    'law': transform_name,
+                    'used_nn': used_nn,
+                    'matched_subexpr': matched_subexpr,
+                    'result_prop': new_prop
+                })
 
             if verbose:
                 nn_marker = "[NN]" if used_nn else "[RND]"
                 print(f"[{iteration}] {nn_marker} Aplicado {transform_name} em prop{which_prop}: {new_prop}")
 
+            met = self._meet(seen, which_prop, new_prop, applied_transformations)
+            if met is not None:
+                if which_prop == 1:
+                    current2, applied_transformations = met
+                else:
+                    current1, applied_transformations = met
+
         # Final check
         if self.are_equal(current1, current2):
-            return {
+            return self._remember_proof(memo_key, start, {
                 'success': True,
                 'iterations': max_iterations,
                 'prop1_final': current1,
                 'prop2_final': current2,
                 'transformations': applied_transformations,
                 'nn_predictions_used': nn_predictions_used
-            }
+            })
 
         if verbose:
             print(f"\nFalha ao provar equivalência após {max_iterations} iterações.")
@@ -1404,15 +1841,11 @@ class Equivalence:
                 - 'backward_proof': Result of proving P2 → P1 = T
                 - 'iterations': Total iterations used
         """
-        from utils.proposition import TRUE
-
         current1 = self._ensure_compound(prop1)
         current2 = self._ensure_compound(prop2)
 
-        # Create T as target
-        t_prop = CompoundProposition()
-        t_prop.root = AtomicNode(TRUE)
-        t_prop.components = {TRUE}
+        # T as target
+        t_prop = self._true_prop
 
         if verbose:
             print("\n" + "="*50)
@@ -1423,7 +1856,7 @@ class Equivalence:
             print()
 
         # Constrói P1 → P2
-        forward_impl = CompoundProposition(Proposition.__rshift__, current1, current2)
+        forward_impl = self._node_to_compound(self._mk_op(Proposition.__rshift__, current1.root, current2.root))
 
         if verbose:
             print("-"*50)
@@ -1452,7 +1885,7 @@ class Equivalence:
             print(f"\n[SUCESSO] P1 → P2 = T provado em {forward_result['iterations']} passos")
 
         # Constrói P2 → P1
-        backward_impl = CompoundProposition(Proposition.__rshift__, current2, current1)
+        backward_impl = self._node_to_compound(self._mk_op(Proposition.__rshift__, current2.root, current1.root))
 
         if verbose:
             print()
@@ -1590,8 +2023,17 @@ class Equivalence:
         Returns:
             dict com resultado da prova
         """
-        from utils.proposition import FALSE
+        return self._prove_by_absurdity(
+            prop1, prop2, predictor, simplification_predictor,
+            max_iterations, verbose, tables_checked=False
+        )
 
+    def _prove_by_absurdity(self, prop1, prop2, predictor, simplification_predictor,
+                            max_iterations: int, verbose: bool, tables_checked: bool) -> dict:
+        """
+        Corpo de prove_by_absurdity; com tables_checked=True não compara as
+        tabelas verdade, que o chamador já comparou (ex.: prove_with_fallback).
+        """
         current1 = self._ensure_compound(prop1)
         current2 = self._ensure_compound(prop2)
 
@@ -1605,14 +2047,28 @@ class Equivalence:
                 print(f"Usando: SimplificationPredictor (especializado para absurdo)")
             print()
 
+        # (P1 ^ ~P2) = F so prova P1 → P2: a estrategia depende das tabelas
+        # verdade iguais, verificadas aqui de uma vez com os bits de todas
+        # as linhas (ver _tables_differ), a menos que o chamador ja o tenha feito
+        if not tables_checked and self._tables_differ(current1, current2):
+            if verbose:
+                print("[FALHA] As tabelas verdade são diferentes: P1 e P2 não são equivalentes")
+            return {
+                'success': False,
+                'method': 'absurdity',
+                'iterations': 0,
+                'transformations': [],
+                'prop1_final': current1,
+                'prop2_final': current2,
+                'reason': 'not_equivalent'
+            }
+
         # Create P1 ^ ~P2
         neg_p2 = CompoundProposition(Proposition.__invert__, current2)
         assumption = CompoundProposition(Proposition.__mul__, current1, neg_p2)
 
-        # Create F as target
-        f_prop = CompoundProposition()
-        f_prop.root = AtomicNode(FALSE)
-        f_prop.components = {FALSE}
+        # F as target
+        f_prop = self._false_prop
 
         if verbose:
             print(f"Provando: {assumption} = F")
@@ -1661,7 +2117,7 @@ class Equivalence:
     def prove_simplification_nn(self, prop: CompoundProposition, goal: str,
                                  predictor, fallback_predictor=None,
                                  max_iterations: int = 50,
-                                 verbose: bool = False) -> dict:
+                                 verbose: bool = False, record_strings: bool = True) -> dict:
         """
         Simplify a single expression to a constant (F or T) using SimplificationPredictor.
 
@@ -1676,6 +2132,9 @@ class Equivalence:
             fallback_predictor: TransformationPredictor for fallback (optional)
             max_iterations: Maximum transformation attempts
             verbose: If True, print each step
+            record_strings: If False, the transformations leave out the
+                'result' and 'p1' texts, for callers that never read them;
+                'result_prop' always holds the resulting proposition
 
         Returns:
             dict with:
@@ -1685,33 +2144,16 @@ class Equivalence:
                 - 'final_prop': Final form of the proposition
                 - 'nn_predictions_used': Count of successful NN predictions
         """
-        from utils.proposition import TRUE, FALSE
-
-        transformations_map = {
-            'double_negation': (self.check_double_negation, self.apply_double_negation),
-            'idempotence': (self.check_idempotence, self.apply_idempotence),
-            'absorption': (self.check_absorption, self.apply_absorption),
-            'factoring': (self.check_factoring, self.apply_factoring),
-            'identity': (self.check_identity, self.apply_identity),
-            'domination': (self.check_domination, self.apply_domination),
-            'negation_constant': (self.check_negation_constant, self.apply_negation_constant),
-            'complement': (self.check_complement, self.apply_complement),
-            'implication_constant': (self.check_implication_constant, self.apply_implication_constant),
-            'de_morgan': (self.check_de_morgan, self.apply_de_morgan),
-            'commutativity': (self.check_commutativity, self.apply_commutativity),
-            'associativity': (self.check_associativity, self.apply_associativity),
-            'implication_elimination': (self.check_implication_elimination, self.apply_implication_elimination),
-            'implication_introduction': (self.check_implication_introduction, self.apply_implication_introduction),
-            'contraposition': (self.check_contraposition, self.apply_contraposition),
-            'de_morgan_reverse': (self.check_de_morgan_reverse, self.apply_de_morgan_reverse),
-            'distributivity': (self.check_distributivity, self.apply_distributivity),
-        }
+        transformations_map = self._transformations_by_name()
 
         current = self._ensure_compound(prop)
         applied_transformations = []
         nn_predictions_used = 0
+        # hash -> (prop, prediction), see _predict_form
+        predictions = {}
 
-        target_constant = FALSE if goal.upper() == 'F' else TRUE
+        # _kind of the goal constant; None never matches a node
+        target_kind = _GOAL_KINDS.get(goal.upper())
 
         if verbose:
             print(f"[SimplificationPredictor] Simplificando para {goal}:")
@@ -1720,29 +2162,29 @@ class Equivalence:
 
         for iteration in range(max_iterations):
             # Check if we've reached the goal
-            if self._is_constant(current.root if hasattr(current, 'root') else current):
-                is_target = (goal.upper() == 'F' and self._is_false_constant(current.root if hasattr(current, 'root') else current)) or \
-                           (goal.upper() == 'T' and self._is_true_constant(current.root if hasattr(current, 'root') else current))
-                if is_target:
-                    if verbose:
-                        print(f"\n[SUCESSO] Alcançou {goal} após {iteration} iterações!")
-                    return {
-                        'success': True,
-                        'iterations': iteration,
-                        'transformations': applied_transformations,
-                        'final_prop': current,
-                        'nn_predictions_used': nn_predictions_used
-                    }
+            if current.root._kind == target_kind:
+                if verbose:
+                    print(f"\n[SUCESSO] Alcançou {goal} após {iteration} iterações!")
+                return {
+                    'success': True,
+                    'iterations': iteration,
+                    'transformations': applied_transformations,
+                    'final_prop': current,
+                    'nn_predictions_used': nn_predictions_used
+                }
 
             # Get NN prediction
-            transform_name = predictor.predict(current, goal=goal)
+            transform_name = self._predict_form(predictor, predictions, current, goal)
             used_nn = False
             matched_subexpr = None
 
+            # Every law applicable anywhere in the proposition, in one lookup
+            laws = self._subtree_laws(current.root)
+
             # Check if prediction is applicable
             if transform_name in transformations_map:
                 check_fn, apply_fn = transformations_map[transform_name]
-                if self._can_apply_anywhere(current, check_fn):
+                if laws & _LAW_BITS[transform_name]:
                     new_prop, matched_subexpr = self._apply_random_transformation_with_location(current, check_fn, apply_fn)
                     used_nn = True
                     nn_predictions_used += 1
@@ -1752,21 +2194,10 @@ class Equivalence:
                 applied = False
 
                 # Priority 1: Simplification ops (complement, domination, identity are key)
-                simplification_priority = [
-                    'complement',      # p ∧ ~p → F (MOST IMPORTANT)
-                    'domination',      # p ∧ F → F
-                    'identity',        # p ∧ T → p
-                    'negation_constant',
-                    'double_negation',
-                    'idempotence',
-                    'absorption',
-                    'factoring',
-                ]
-
-                for t_name in simplification_priority:
+                for t_name in _SIMPLIFICATION_PRIORITY:
                     if t_name in transformations_map:
                         check_fn, apply_fn = transformations_map[t_name]
-                        if self._can_apply_anywhere(current, check_fn):
+                        if laws & _LAW_BITS[t_name]:
                             new_prop, matched_subexpr = self._apply_random_transformation_with_location(current, check_fn, apply_fn)
                             transform_name = t_name
                             applied = True
@@ -1774,17 +2205,10 @@ class Equivalence:
 
                 # Priority 2: Structure ops that expose complement
                 if not applied:
-                    structure_priority = [
-                        'distributivity',   # Expose p ∧ ~p patterns
-                        'associativity',    # Regroup terms
-                        'de_morgan',
-                        'implication_elimination',
-                        'commutativity',
-                    ]
-                    for t_name in structure_priority:
+                    for t_name in _STRUCTURE_PRIORITY:
                         if t_name in transformations_map:
                             check_fn, apply_fn = transformations_map[t_name]
-                            if self._can_apply_anywhere(current, check_fn):
+                            if laws & _LAW_BITS[t_name]:
                                 new_prop, matched_subexpr = self._apply_random_transformation_with_location(current, check_fn, apply_fn)
                                 transform_name = t_name
                                 applied = True
@@ -1795,33 +2219,42 @@ class Equivalence:
 
             current = new_prop
 
-            applied_transformations.append({
-                'iteration': iteration,
-                'proposition': 1,
-                'law': transform_name,
-                'result': str(new_prop),
-                'used_nn': used_nn,
-                'matched_subexpr': matched_subexpr,
-                'p1': str(current),
-                'p2': goal
-            })
+            if record_strings:
+                applied_transformations.append({
+                    'iteration': iteration,
+                    'proposition': 1,
+                    'law': transform_name,
+                    'result': str(new_prop),
+                    'used_nn': used_nn,
+                    'matched_subexpr': matched_subexpr,
+                    'p1': str(current),
+                    'p2': goal,
+                    'result_prop': new_prop
+                })
+            else:
+                applied_transformations.append({
+                    'iteration': iteration,
+                    'proposition': 1,
+                    'law': transform_name,
+                    'used_nn': used_nn,
+                    'matched_subexpr': matched_subexpr,
+                    'p2': goal,
+                    'result_prop': new_prop
+                })
 
             if verbose:
                 nn_marker = "[NN]" if used_nn else "[RND]"
                 print(f"[{iteration}] {nn_marker} {transform_name}: {new_prop}")
 
         # Final check
-        if self._is_constant(current.root if hasattr(current, 'root') else current):
-            is_target = (goal.upper() == 'F' and self._is_false_constant(current.root if hasattr(current, 'root') else current)) or \
-                       (goal.upper() == 'T' and self._is_true_constant(current.root if hasattr(current, 'root') else current))
-            if is_target:
-                return {
-                    'success': True,
-                    'iterations': max_iterations,
-                    'transformations': applied_transformations,
-                    'final_prop': current,
-                    'nn_predictions_used': nn_predictions_used
-                }
+        if current.root._kind == target_kind:
+            return {
+                'success': True,
+                'iterations': max_iterations,
+                'transformations': applied_transformations,
+                'final_prop': current,
+                'nn_predictions_used': nn_predictions_used
+            }
 
         if verbose:
             print(f"\n[FALHA] Não foi possível alcançar {goal} após {max_iterations} iterações")
@@ -1853,7 +2286,11 @@ class Equivalence:
             verbose: If True, print proof steps
 
         Returns:
-            dict with proof result and method used
+            dict with proof result and method used; 'method' is
+            'not_equivalent' when the truth tables differ and no strategy
+            was tried. The tables are only compared upfront for at most
+            _TABLE_CHECK_MAX_VARIABLES (16) distinct atoms; larger
+            propositions go straight to the bounded strategies
         """
         total_iterations = 0
 
@@ -1863,6 +2300,22 @@ class Equivalence:
             print("="*60)
             print(f"\nTentando provar: {prop1} ≡ {prop2}")
 
+        # Every law keeps the truth table: when the tables differ no strategy
+        # can succeed, and one truth table comparison saves all three searches
+        if self._tables_differ(prop1, prop2):
+            if verbose:
+                print("\n✗ As proposições não são equivalentes (tabelas verdade diferentes)")
+            return {
+                'success': False,
+                'method': 'not_equivalent',
+                'iterations': 0,
+                'transformations': [],
+                'prop1_final': self._ensure_compound(prop1),
+                'prop2_final': self._ensure_compound(prop2),
+                'reason': 'not_equivalent',
+                'total_iterations': total_iterations
+            }
+
         # Estratégia 1: Prova direta
         if verbose:
             print("\n" + "-"*60)
@@ -1916,10 +2369,9 @@ class Equivalence:
             print("[Estratégia 3] Prova por absurdo (P1 ^ ~P2 = F)")
             print("-"*60)
 
-        absurd_result = self.prove_by_absurdity(
-            prop1, prop2, predictor,
-            simplification_predictor=simplification_predictor,
-            max_iterations=max_iterations, verbose=verbose
+        absurd_result = self._prove_by_absurdity(
+            prop1, prop2, predictor, simplification_predictor,
+            max_iterations, verbose, tables_checked=True
         )
         total_iterations += absurd_result['iterations']
 
@@ -2004,24 +2456,32 @@ class Equivalence:
             print()
 
         # Collect intermediate states from the proof
-        # We need to reconstruct them from the transformation results
         intermediate_states = []
         for t in transformations:
-            # Parse the result string back to a proposition
+            # The provers log the proposition each step produced
+            result_prop = t.get('result_prop')
+            if isinstance(result_prop, CompoundProposition):
+                intermediate_states.append({
+                    'step': t['iteration'],
+                    'prop': result_prop,
+                    'law': t['law'],
+                    'result_str': t.get('result') or str(result_prop)
+                })
+                continue
+            # Otherwise parse the result string back to a proposition
             result_str = t.get('result', '')
             if result_str:
                 try:
-                    from main import parse_proposition
                     parsed, _ = parse_proposition(result_str)
-                    if isinstance(parsed, CompoundProposition):
-                        intermediate_states.append({
-                            'step': t['iteration'],
-                            'prop': parsed,
-                            'law': t['law'],
-                            'result_str': result_str
-                        })
-                except:
-                    pass
+                except ParseError:
+                    continue
+                if isinstance(parsed, CompoundProposition):
+                    intermediate_states.append({
+                        'step': t['iteration'],
+                        'prop': parsed,
+                        'law': t['law'],
+                        'result_str': result_str
+                    })
 
         if not intermediate_states:
             return {
@@ -2033,6 +2493,8 @@ class Equivalence:
         shortcuts_found = []
         best_shortcut = None
         best_savings = 0
+        # Pairs already probed, see _probe_shortcut
+        probes = {}
 
         current1 = self._ensure_compound(prop1)
 
@@ -2046,14 +2508,20 @@ class Equivalence:
             if steps_to_skip < 2:
                 continue  # Not worth optimizing
 
+            # Reaching this step in k steps saves steps_to_skip + 1 - k, so
+            # only k <= steps_to_skip - best_savings beats the best so far.
+            # The steps only get smaller from here on.
+            budget = min(max_iterations, steps_to_skip - best_savings)
+            if budget < 0:
+                break
+
             if verbose:
                 print(f"Tentando alcançar passo {target_state['step']} diretamente...")
                 print(f"  Alvo: {target_state['result_str'][:60]}{'...' if len(target_state['result_str']) > 60 else ''}")
 
             # Try direct proof from P1 to this intermediate state
-            shortcut_result = self.prove_equivalence_nn(
-                current1, target_prop, predictor,
-                max_iterations=max_iterations, verbose=False
+            shortcut_result = self._probe_shortcut(
+                probes, current1, target_prop, predictor, budget
             )
 
             if shortcut_result['success']:
@@ -2104,10 +2572,10 @@ class Equivalence:
                 source_prop = source_state['prop']
                 target_prop = target_state['prop']
 
-                shortcut_result = self.prove_equivalence_nn(
-                    source_prop, target_prop, predictor,
-                    max_iterations=min(max_iterations, steps_between - 1),
-                    verbose=False
+                # Only a shortcut of at most steps_between - 2 steps saves any
+                shortcut_result = self._probe_shortcut(
+                    probes, source_prop, target_prop, predictor,
+                    min(max_iterations, steps_between - 2)
                 )
 
                 if shortcut_result['success']:
@@ -2164,6 +2632,27 @@ class Equivalence:
             'reason': 'no_beneficial_shortcuts'
         }
 
+    def _probe_shortcut(self, probes: dict, source, target, predictor, max_iterations: int) -> dict:
+        """
+        Run prove_equivalence_nn from source to target, at most once per
+        pair during an optimization.
+
+        A proof often goes back to a form it had a few steps earlier, so
+        the same pair is probed from several steps. The proof memo only
+        keeps successes; failed probes are answered from `probes` too:
+        (hash1, hash2, max_iterations) -> (source, target, result).
+        """
+        key = (source.root._hash, target.root._hash, max_iterations)
+        entry = probes.get(key)
+        if entry is not None and self.are_equal(entry[0], source) and self.are_equal(entry[1], target):
+            return entry[2]
+        result = self.prove_equivalence_nn(
+            source, target, predictor,
+            max_iterations=max_iterations, verbose=False
+        )
+        probes[key] = (source, target, result)
+        return result
+
     def prove_and_optimize(self, prop1: CompoundProposition, prop2: CompoundProposition,
                            predictor, max_iterations: int = 50,
                            optimize_iterations: int = 15,
@@ -2234,3 +2723,117 @@ class Equivalence:
             'final_steps': optimization.get('optimized_steps', original_steps),
             'was_optimized': optimization.get('optimized', False)
         }
+
+
+# Law name -> the _match_* helper its check_* and apply_* are built on
+_LAW_MATCHERS = {
+    'double_negation': Equivalence._match_double_negation,
+    'idempotence': Equivalence._match_idempotence,
+    'absorption': Equivalence._match_absorption,
+    'factoring': Equivalence._match_factoring,
+    'identity': Equivalence._match_identity,
+    'domination': Equivalence._match_domination,
+    'negation_constant': Equivalence._match_negation_constant,
+    'complement': Equivalence._match_complement,
+    'implication_constant': Equivalence._match_implication_constant,
+    'de_morgan': Equivalence._match_de_morgan,
+    'commutativity': Equivalence._match_binary_and_or,
+    'associativity': Equivalence._match_associativity,
+    'implication_elimination': Equivalence._match_implication,
+    'implication_introduction': Equivalence._match_implication_introduction,
+    'contraposition': Equivalence._match_implication,
+    'de_morgan_reverse': Equivalence._match_binary_and_or,
+    'distributivity': Equivalence._match_distributivity,
+}
+
+# check_* method -> the _match_* helper it is built on, so that subtrees
+# can be matched without wrapping them in a CompoundProposition
+_NODE_MATCHERS = {
+    getattr(Equivalence, 'check_' + name): match
+    for name, match in _LAW_MATCHERS.items()
+}
+
+# Root operator -> the laws whose pattern starts with it
+_AND_OR_LAWS = (
+    'idempotence', 'absorption', 'factoring', 'identity', 'domination',
+    'complement', 'commutativity', 'associativity', 'de_morgan_reverse',
+    'distributivity',
+)
+_LAWS_BY_ROOT_OP = {
+    OP_NOT: ('double_negation', 'negation_constant', 'de_morgan'),
+    OP_IMP: ('implication_constant', 'implication_elimination', 'contraposition'),
+    OP_OR: _AND_OR_LAWS + ('implication_introduction',),
+    OP_AND: _AND_OR_LAWS,
+}
+
+# _match_* helper -> bitmask of the op_ids its pattern can start with
+_MATCHER_ROOT_OPS = {
+    match: sum(
+        1 << op_id for op_id, names in _LAWS_BY_ROOT_OP.items()
+        if any(_LAW_MATCHERS[name] is match for name in names)
+    )
+    for match in set(_LAW_MATCHERS.values())
+}
+
+# _match_* helper -> its bit in Equivalence._subtree_laws; the truth
+# constant laws keep the bits Equivalence._constant_laws computes for them
+_CONSTANT_LAW_BITS = {
+    Equivalence._match_identity: _IDENTITY,
+    Equivalence._match_domination: _DOMINATION,
+    Equivalence._match_negation_constant: _NEGATION_CONSTANT,
+    Equivalence._match_complement: _COMPLEMENT,
+    Equivalence._match_implication_constant: _IMPLICATION_CONSTANT,
+}
+_MATCHER_BITS = dict(_CONSTANT_LAW_BITS)
+_MATCHER_BITS.update({
+    match: 1 << (len(_CONSTANT_LAW_BITS) + i)
+    for i, match in enumerate(dict.fromkeys(
+        m for m in _LAW_MATCHERS.values() if m not in _CONSTANT_LAW_BITS
+    ))
+})
+
+# apply_* method -> the _match_* helper returning the constant it rewrites to
+_CONSTANT_RESULT_MATCHERS = {
+    Equivalence.apply_complement: Equivalence._match_complement,
+    Equivalence.apply_domination: Equivalence._match_domination,
+    Equivalence.apply_negation_constant: Equivalence._match_negation_constant,
+}
+
+# Law name -> its bit in Equivalence._subtree_laws
+_LAW_BITS = {name: _MATCHER_BITS[match] for name, match in _LAW_MATCHERS.items()}
+
+# Necessary conditions on the operator tags (see PropositionNode._shape)
+# of a node and its two children for a _match_* helper to accept it.
+# `dual` is the tag of the dual of the root operator.
+_SHAPE_CONDITIONS = {
+    Equivalence._match_double_negation: lambda root, left, right, dual: left == _TAG_NOT,
+    Equivalence._match_de_morgan: lambda root, left, right, dual: left > _TAG_IMP,
+    Equivalence._match_idempotence: lambda root, left, right, dual: left == right,
+    Equivalence._match_absorption: lambda root, left, right, dual: dual in (left, right),
+    Equivalence._match_distributivity: lambda root, left, right, dual: dual in (left, right),
+    Equivalence._match_factoring: lambda root, left, right, dual: left == right == dual,
+    Equivalence._match_associativity: lambda root, left, right, dual: left == root,
+    Equivalence._match_implication_introduction: lambda root, left, right, dual: left == _TAG_NOT,
+}
+
+
+def _shape_matchers(shape):
+    """(matcher, bit) of the non constant laws that may accept a node of this shape."""
+    root, left, right = shape >> 6, (shape >> 3) & 7, shape & 7
+    dual = ((root - 1) ^ 1) + 1
+    candidates = []
+    for match, bit in _MATCHER_BITS.items():
+        if match in _CONSTANT_LAW_BITS or not (_MATCHER_ROOT_OPS[match] >> (root - 1)) & 1:
+            continue
+        condition = _SHAPE_CONDITIONS.get(match)
+        if condition is None or condition(root, left, right, dual):
+            candidates.append((match, bit))
+    return tuple(candidates)
+
+
+# PropositionNode._shape -> the candidates Equivalence._root_laws runs, so
+# the laws ruled out by the operators alone are dropped with one lookup
+_MATCHERS_BY_SHAPE = tuple(
+    _shape_matchers(shape) if shape >> 6 else ()
+    for shape in range((_TAG_AND << 6 | _TAG_AND << 3 | _TAG_AND) + 1)
+)
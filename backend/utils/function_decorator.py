@@ -1,7 +1,24 @@
+# Integer tags of the operators, compared instead of the method names.
+# OR and AND are the two highest tags, so op_id >= OP_OR tests for either,
+# and they differ in the lowest bit only, so op_id ^ 1 maps one to the other.
+OP_NOT = 0
+OP_IMP = 1
+OP_OR = 2
+OP_AND = 3
+
+_OP_IDS = {
+    '__invert__': OP_NOT,
+    '__rshift__': OP_IMP,
+    '__add__': OP_OR,
+    '__mul__': OP_AND,
+}
+
+
 class LogicOperator:
     def __init__(self, functor):
         self.functor = functor
         self.name = functor.__name__
+        self.op_id = _OP_IDS.get(self.name)
         self.__doc__ = functor.__doc__
         self.mapping = {
             '__add__': 'v',
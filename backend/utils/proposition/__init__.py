@@ -86,9 +86,28 @@ TRUE = TruthConstant(True)
 FALSE = TruthConstant(False)
 
 
+# Values of PropositionNode._kind
+KIND_VARIABLE = 0
+KIND_TRUE = 1
+KIND_FALSE = 2
+
+
 class PropositionNode:
     """Base class for tree nodes."""
 
+    # Proofs build many small nodes: no per-instance __dict__
+    __slots__ = ()
+
+    # Shape flags read by the equivalence laws instead of isinstance checks
+    is_op = False
+    arity = 0
+    # KIND_TRUE / KIND_FALSE for the leaves holding a truth constant
+    _kind = KIND_VARIABLE
+    # Operator tag (op_id + 1, 0 for a leaf) and the shape key packing the
+    # tags of the node and its children: tag << 6 | left << 3 | right
+    _tag = 0
+    _shape = 0
+
     def evaluate(self) -> bool:
         raise NotImplementedError
 
@@ -99,8 +118,16 @@ class PropositionNode:
 class AtomicNode(PropositionNode):
     """Leaf node wrapping an atomic Proposition."""
 
+    __slots__ = ('proposition', '_kind', '_hash')
+
     def __init__(self, proposition: Proposition):
         self.proposition = proposition
+        if proposition.is_constant():
+            self._kind = KIND_TRUE if proposition.is_true() else KIND_FALSE
+        else:
+            self._kind = KIND_VARIABLE
+        # Structural hash, see OperatorNode._hash
+        self._hash = hash(proposition.text)
 
     def evaluate(self) -> bool:
         return self.proposition.value
@@ -118,10 +145,23 @@ class AtomicNode(PropositionNode):
 class OperatorNode(PropositionNode):
     """Node representing an operator with operands."""
 
+    __slots__ = ('operator', 'left', 'right', 'arity', '_tag', '_shape',
+                 '_str', '_components', '_hash')
+
+    is_op = True
+
     def __init__(self, operator, left, right=None):
         self.operator = operator
         self.left = left
         self.right = right
+        self.arity = 1 if right is None else 2
+        self._tag = operator.op_id + 1
+        self._shape = self._tag << 6 | left._tag << 3 | (0 if right is None else right._tag)
+        self._str = None
+        self._components = None
+        # Hash of the operator and the shape of the subtree: equal subtrees
+        # always have equal hashes, so different hashes rule out equality
+        self._hash = hash((operator.op_id, left._hash, 0 if right is None else right._hash))
 
     def evaluate(self) -> bool:
         left_val = Proposition("", self.left.evaluate())
@@ -131,15 +171,38 @@ class OperatorNode(PropositionNode):
         return self.operator(left_val, right_val).value
 
     def get_components(self) -> set:
-        result = self.left.get_components()
-        if self.right:
-            result |= self.right.get_components()
-        return result
+        # The subtree never changes, so its leaves are collected once; each
+        # call still returns a new set the caller is free to modify
+        if self._components is None:
+            # Walk the subtree with an explicit stack and fill a single set,
+            # instead of building and merging one set per node. Subtrees
+            # that already know their leaves are not walked again, so a
+            # tree rebuilt along one path only walks that path.
+            result = set()
+            stack = [self.left]
+            if self.right:
+                stack.append(self.right)
+            while stack:
+                node = stack.pop()
+                if not node.is_op:
+                    result.add(node.proposition)
+                elif node._components is not None:
+                    result |= node._components
+                else:
+                    stack.append(node.left)
+                    if node.right:
+                        stack.append(node.right)
+            self._components = frozenset(result)
+        return set(self._components)
 
     def __str__(self) -> str:
-        if self.right is None:
-            return f"({self.operator}{self.left})"
-        return f"({self.left} {self.operator} {self.right})"
+        # Nodes are never modified after construction, so the text is cached
+        if self._str is None:
+            if self.right is None:
+                self._str = f"({self.operator}{self.left})"
+            else:
+                self._str = f"({self.left} {self.operator} {self.right})"
+        return self._str
 
     def __repr__(self) -> str:
         return str(self)
@@ -148,6 +211,8 @@ class OperatorNode(PropositionNode):
 class CompoundProposition:
     """A compound proposition represented as a tree structure."""
 
+    __slots__ = ('root', 'components')
+
     def __init__(self, operator=None, left=None, right=None):
         """
         Create a compound proposition as a tree.
@@ -234,6 +299,7 @@ class CompoundProposition:
 
 # Import parser functions after class definitions to avoid circular imports
 from .parser import parse_proposition, set_proposition_values, ParseError
+from .evaluator import truth_table_bits
 
 __all__ = [
     'Proposition',
@@ -248,4 +314,5 @@ __all__ = [
     'parse_proposition',
     'set_proposition_values',
     'ParseError',
+    'truth_table_bits',
 ]
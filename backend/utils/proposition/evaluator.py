@@ -0,0 +1,233 @@
+"""
+Bit-parallel evaluation of propositions over a whole truth table.
+
+Every row of the truth table is one bit of a Python integer: for the
+variables ``names`` (in order), row ``i`` assigns ``names[j]`` the value
+``(i >> j) & 1``. Evaluating a proposition once with bitwise operators
+on these integers yields its value on all ``2 ** n`` rows at the same
+time, which makes comparing two truth tables a single ``==``.
+
+Examples:
+    >>> prop, props = parse_proposition("p -> q")
+    >>> bin(truth_table_bits(prop, ['p', 'q']))
+    '0b1101'
+"""
+
+from functools import lru_cache
+
+from utils.proposition import Proposition, CompoundProposition, AtomicNode
+
+
+# Opcodes of the postfix tape produced by compile_tape
+OP_VAR = 0
+OP_TRUE = 1
+OP_FALSE = 2
+OP_NOT = 3
+OP_AND = 4
+OP_OR = 5
+OP_IMPL = 6
+
+_OPCODES = {
+    '__invert__': OP_NOT,
+    '__mul__': OP_AND,
+    '__add__': OP_OR,
+    '__rshift__': OP_IMPL,
+}
+
+
+def row_count(n):
+    """Number of rows in the truth table of `n` variables."""
+    return 1 << n
+
+
+# Masks are cached only up to this many variables: a column of n variables
+# is a 2**n bit integer, so caching larger tables would pin megabytes each.
+_CACHED_VARIABLES = 16
+
+
+def full_mask(n):
+    """Integer with one set bit per row of an `n` variable truth table."""
+    if n <= _CACHED_VARIABLES:
+        return _cached_full_mask(n)
+    return (1 << row_count(n)) - 1
+
+
+def column_mask(j, n):
+    """
+    Truth table column of the j-th variable out of `n`.
+
+    Bit i is set when (i >> j) & 1, i.e. blocks of 2**j zeros followed by
+    2**j ones, repeated over the 2**n rows.
+    """
+    if n <= _CACHED_VARIABLES:
+        return _cached_column_mask(j, n)
+    return _build_column_mask(j, n)
+
+
+@lru_cache(maxsize=_CACHED_VARIABLES + 1)
+def _cached_full_mask(n):
+    return (1 << row_count(n)) - 1
+
+
+@lru_cache(maxsize=256)
+def _cached_column_mask(j, n):
+    return _build_column_mask(j, n)
+
+
+def _build_column_mask(j, n):
+    width = 1 << j
+    mask = ((1 << width) - 1) << width
+    period = width << 1
+    rows = row_count(n)
+    # Double the repeated block until it covers every row
+    while period < rows:
+        mask |= mask << period
+        period <<= 1
+    return mask
+
+
+def compile_tape(prop, names):
+    """
+    Flatten a proposition into a postfix tape of (opcode, argument) pairs.
+
+    OP_VAR carries the index of the variable in `names`; every other
+    opcode ignores its argument. The tape can be evaluated any number of
+    times with run_tape.
+    """
+    if isinstance(prop, Proposition):
+        root = AtomicNode(prop)
+    elif isinstance(prop, CompoundProposition):
+        root = prop.root
+    else:
+        raise TypeError(f"Cannot evaluate {type(prop)}")
+
+    index = {name: j for j, name in enumerate(names)}
+    tape = []
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, AtomicNode):
+            leaf = node.proposition
+            if not leaf.is_constant():
+                tape.append((OP_VAR, index[leaf.text]))
+            elif leaf.is_true():
+                tape.append((OP_TRUE, 0))
+            else:
+                tape.append((OP_FALSE, 0))
+        elif expanded:
+            op = _OPCODES.get(node.operator.name)
+            if op is None:
+                raise ValueError(f"Unknown operator: {node.operator.name}")
+            tape.append((op, 0))
+        else:
+            stack.append((node, True))
+            if node.right is not None:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+
+    return tuple(tape)
+
+
+def run_tape(tape, n):
+    """Evaluate a tape on every row of an `n` variable truth table."""
+    full = full_mask(n)
+    stack = []
+    push = stack.append
+    pop = stack.pop
+
+    for op, arg in tape:
+        if op == OP_VAR:
+            push(column_mask(arg, n))
+        elif op == OP_TRUE:
+            push(full)
+        elif op == OP_FALSE:
+            push(0)
+        elif op == OP_NOT:
+            stack[-1] ^= full
+        else:
+            right = pop()
+            if op == OP_AND:
+                stack[-1] &= right
+            elif op == OP_OR:
+                stack[-1] |= right
+            else:
+                stack[-1] = (full ^ stack[-1]) | right
+
+    return stack[0]
+
+
+def truth_table_bits(prop, names):
+    """
+    Evaluate a proposition on every row of the truth table at once.
+
+    Args:
+        prop: Proposition or CompoundProposition
+        names: ordered variable names defining the rows
+
+    Returns:
+        int: bit i holds the value of the proposition on row i
+    """
+    return run_tape(compile_tape(prop, names), len(names))
+
+
+def node_bits(prop, names):
+    """
+    Evaluate every operator node of a proposition in a single walk.
+
+    Shared subtrees are evaluated once: each node reads its children's
+    results instead of re-walking them.
+
+    Returns:
+        dict: id(node) -> truth table bits, for every OperatorNode of `prop`
+    """
+    if not isinstance(prop, CompoundProposition) or prop.root is None:
+        return {}
+
+    n = len(names)
+    full = full_mask(n)
+    index = {name: j for j, name in enumerate(names)}
+    results = {}
+    values = []
+    stack = [(prop.root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, AtomicNode):
+            leaf = node.proposition
+            if not leaf.is_constant():
+                values.append(column_mask(index[leaf.text], n))
+            else:
+                values.append(full if leaf.is_true() else 0)
+        elif not expanded:
+            stack.append((node, True))
+            if node.right is not None:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+        else:
+            op = _OPCODES.get(node.operator.name)
+            if op is None:
+                raise ValueError(f"Unknown operator: {node.operator.name}")
+            if op == OP_NOT:
+                bits = full ^ values.pop()
+            else:
+                right = values.pop()
+                left = values.pop()
+                if op == OP_AND:
+                    bits = left & right
+                elif op == OP_OR:
+                    bits = left | right
+                else:
+                    bits = (full ^ left) | right
+            results[id(node)] = bits
+            values.append(bits)
+
+    return results
+
+
+def unpack_bits(bits, num_rows):
+    """
+    Expand a truth table column into a list of booleans, row 0 first.
+
+    The integer is formatted to binary once instead of shifting it for
+    every row.
+    """
+    return [c == '1' for c in reversed(format(bits, f'0{num_rows}b'))]
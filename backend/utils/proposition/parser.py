@@ -31,7 +31,11 @@ Examples:
 """
 
 import re
-from utils.proposition import Proposition, CompoundProposition, TRUE, FALSE
+from functools import lru_cache
+
+from utils.proposition import (
+    Proposition, CompoundProposition, AtomicNode, OperatorNode, TRUE, FALSE
+)
 
 
 class ParseError(Exception):
@@ -339,8 +343,66 @@ def parse_proposition(text):
     if not text or not text.strip():
         raise ParseError("Empty expression")
 
-    parser = Parser(text.strip())
-    return parser.parse()
+    template, names = _parse_template(text.strip())
+    # Fresh Proposition objects on every call: their values are mutable
+    props = {name: Proposition(text=name, value=False) for name in names}
+    return _thaw(template, props), props
+
+
+@lru_cache(maxsize=1024)
+def _parse_template(text):
+    """
+    Parse `text` into an immutable template, cached by input string.
+
+    Returns:
+        tuple: (template, names) where names lists the atoms in the order
+        they first appear (see _freeze for the template format).
+    """
+    prop, props = Parser(text).parse()
+    return _freeze(prop), tuple(props)
+
+
+def _freeze(value):
+    """
+    Convert a parsed proposition into a template that holds no mutable state.
+
+    Atoms become their name, truth constants stay as the TRUE/FALSE
+    singletons and operators become (operator, left, right) tuples, with
+    right set to None for unary operators.
+    """
+    if isinstance(value, CompoundProposition):
+        return _freeze(value.root)
+    if isinstance(value, OperatorNode):
+        right = None if value.right is None else _freeze(value.right)
+        return (value.operator, _freeze(value.left), right)
+    if isinstance(value, AtomicNode):
+        return _freeze(value.proposition)
+    if value.is_constant():
+        return value
+    return value.text
+
+
+def _thaw_node(template, props):
+    """Build the node tree for a template, reusing the atoms in `props`."""
+    if isinstance(template, tuple):
+        operator, left, right = template
+        right_node = None if right is None else _thaw_node(right, props)
+        return OperatorNode(operator, _thaw_node(left, props), right_node)
+    if isinstance(template, str):
+        return AtomicNode(props[template])
+    return AtomicNode(template)
+
+
+def _thaw(template, props):
+    """Rebuild a proposition equivalent to the one the template came from."""
+    if isinstance(template, str):
+        return props[template]
+    if not isinstance(template, tuple):
+        return template
+    prop = CompoundProposition()
+    prop.root = _thaw_node(template, props)
+    prop.components = prop.root.get_components()
+    return prop
 
 
 def set_proposition_values(propositions, values):